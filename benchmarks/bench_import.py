@@ -0,0 +1,73 @@
+"""Benchmark the cold import time of the platforms with device implementations.
+
+Every measurement runs in a new interpreter, so modules are not cached. The
+lazy import shows the time spent by an account without these devices, while
+the full import resolves every implementation (as before the lazy registry).
+
+Usage: python benchmarks/bench_import.py [--runs 5]
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+ROOT = Path(__file__).parent.parent
+
+REGISTRIES = {
+    "climate": "custom_components.tahoma.climate:TYPE",
+    "water_heater": "custom_components.tahoma.water_heater:TYPE",
+    "alarm_control_panel": "custom_components.tahoma.alarm_entities:WIDGET_TO_ALARM_ENTITY",
+}
+
+SCRIPT = """
+import importlib, time
+import custom_components.tahoma
+started = time.perf_counter()
+module = importlib.import_module("{module}")
+registry = getattr(module, "{attribute}")
+if {resolve}:
+    for widget in registry:
+        registry[widget]
+print(time.perf_counter() - started)
+"""
+
+
+def measure(registry: str, resolve: bool, runs: int) -> float:
+    """Return the median import time in milliseconds of a registry module."""
+    module, attribute = registry.split(":")
+    script = SCRIPT.format(module=module, attribute=attribute, resolve=resolve)
+    durations = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", script],
+                cwd=ROOT,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(runs)
+    ]
+
+    return statistics.median(durations) * 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'platform':<20} {'lazy (ms)':>10} {'full (ms)':>10} {'saved (ms)':>10}")
+
+    for platform, registry in REGISTRIES.items():
+        lazy = measure(registry, False, args.runs)
+        full = measure(registry, True, args.runs)
+        print(f"{platform:<20} {lazy:>10.1f} {full:>10.1f} {full - lazy:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
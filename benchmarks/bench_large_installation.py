@@ -0,0 +1,455 @@
+"""Benchmark the integration with synthetic installations of many devices.
+
+Every installation size runs in a new interpreter, against the fake Overkiz
+cloud server of the tests. The server runs in another process, so neither its
+CPU time nor its copy of the setup is included in the measurements.
+
+Measured per installation size, in the Home Assistant process:
+- setup_seconds: wall time of setting up the config entry (with its platforms)
+- poll_cpu_ms: median CPU time of the process per poll, with 1% of the devices
+  reporting a state change. This includes the HTTP client, the processing of
+  the events and the state writes of the entities.
+- state_writes_per_event: entity state writes per device state changed event
+- peak_memory_mib: peak resident memory of the process, including Home
+  Assistant itself
+- command_latency_ms: median time between a cover service call and the state
+  reported by the server being written to the entity
+
+Usage: python -m benchmarks.bench_large_installation [--devices 100 1000 5000]
+    [--polls 20] [--commands 5] [--output results.json]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+from pathlib import Path
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+from unittest.mock import patch
+
+from aiohttp import ClientSession, web
+from pyoverkiz.const import SUPPORTED_SERVERS
+from pyoverkiz.enums import EventName, UIClass, UIWidget
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.tahoma.const import DOMAIN, OVERKIZ_DEVICE_TO_PLATFORM
+from homeassistant import loader
+from homeassistant.const import EVENT_STATE_CHANGED, Platform
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+
+from tests.fake_overkiz import (
+    CLOUD_API_PATH,
+    TEST_GATEWAY_ID,
+    TEST_PASSWORD,
+    TEST_USERNAME,
+    FakeOverkizCloud,
+)
+
+ROOT = Path(__file__).parent.parent
+MODULE = "benchmarks.bench_large_installation"
+
+DEFAULT_DEVICES = [100, 1000, 5000]
+
+NOTE = (
+    "Measured in the Home Assistant process, without the fake server: poll CPU "
+    "includes the HTTP client, event processing and state writes, memory "
+    "includes Home Assistant itself."
+)
+
+# Platforms of which the entities only need the generic definition below. The
+# climate, water heater and alarm implementations rely on states and linked
+# sub devices which are specific to each product.
+SYNTHETIC_PLATFORMS = {
+    Platform.COVER,
+    Platform.LIGHT,
+    Platform.LOCK,
+    Platform.SIREN,
+    Platform.SWITCH,
+}
+
+# Commands and states shared by all synthetic devices, covering the
+# definitions used by the entities of the supported platforms
+COMMANDS = [
+    "close",
+    "identify",
+    "lock",
+    "my",
+    "off",
+    "on",
+    "open",
+    "setClosure",
+    "setIntensity",
+    "setOrientation",
+    "setTargetTemperature",
+    "stop",
+    "unlock",
+]
+STATES = {
+    "core:ClosureState": 50,
+    "core:DiscreteRSSILevelState": "good",
+    "core:LightIntensityState": 50,
+    "core:LockedUnlockedState": "locked",
+    "core:OnOffState": "off",
+    "core:OpenClosedState": "open",
+    "core:RSSILevelState": 80,
+    "core:SlateOrientationState": 0,
+    "core:StatusState": "available",
+    "core:TargetTemperatureState": 21,
+    "core:TemperatureState": 20.5,
+}
+
+
+def synthetic_device(index: int, key: UIClass | UIWidget) -> dict[str, Any]:
+    """Return a device of which the widget or ui class maps to a platform."""
+    if isinstance(key, UIWidget):
+        widget, ui_class = key, UIClass.GENERIC
+    else:
+        widget, ui_class = UIWidget.UNKNOWN, key
+
+    return {
+        "deviceURL": device_url(index),
+        "available": True,
+        "enabled": True,
+        "label": f"{key} {index}",
+        "controllableName": f"io:{key}Component",
+        "definition": {
+            "commands": [
+                {"commandName": command, "nparams": 1} for command in COMMANDS
+            ],
+            "states": [{"qualifiedName": name} for name in STATES],
+            "widgetName": widget,
+            "uiClass": ui_class,
+        },
+        "widget": widget,
+        "uiClass": ui_class,
+        "states": [
+            {"name": name, "type": 1 if isinstance(value, int) else 3, "value": value}
+            for name, value in STATES.items()
+        ],
+        "type": 1,
+        "placeOID": "place",
+    }
+
+
+def device_url(index: int) -> str:
+    """Return the device url of a synthetic device."""
+    return f"io://{TEST_GATEWAY_ID}/{index}"
+
+
+def synthetic_devices(count: int) -> list[dict[str, Any]]:
+    """Return devices drawn in turn from the mapped widgets and ui classes."""
+    # Roller shutters come first, since they receive the benchmarked commands
+    keys = sorted(
+        (
+            key
+            for key, mapped in OVERKIZ_DEVICE_TO_PLATFORM.items()
+            if mapped in SYNTHETIC_PLATFORMS
+        ),
+        key=lambda key: key != UIClass.ROLLER_SHUTTER,
+    )
+
+    return [
+        synthetic_device(index, key)
+        for index, key in zip(range(count), itertools.cycle(keys))
+    ]
+
+
+def closure_event(device_url: str, closure: int) -> dict[str, Any]:
+    """Return a device state changed event of the closure state."""
+    return {
+        "name": EventName.DEVICE_STATE_CHANGED,
+        "deviceURL": device_url,
+        "deviceStates": [{"name": "core:ClosureState", "type": 1, "value": closure}],
+    }
+
+
+class FakeCloudProcess:
+    """Serve a fake Overkiz cloud server of synthetic devices from another process."""
+
+    def __init__(self, devices: int) -> None:
+        """Initialize the server process."""
+        self.devices = devices
+        self.port = 0
+        self._process: subprocess.Popen | None = None
+
+    def __enter__(self) -> FakeCloudProcess:
+        """Start serving, and return once the server listens."""
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", MODULE, "--serve", str(self.devices)],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        assert self._process.stdout
+        self.port = int(self._process.stdout.readline())
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        """Stop serving."""
+        assert self._process
+        self._process.terminate()
+        self._process.wait()
+
+    @property
+    def host(self) -> str:
+        """Return the host of the server."""
+        # Cookies are not accepted from IP addresses
+        return f"localhost:{self.port}"
+
+    async def async_queue_events(
+        self, session: ClientSession, events: list[dict[str, Any]]
+    ) -> None:
+        """Queue events, returned by the next fetch of the integration."""
+        async with session.post(
+            f"http://{self.host}{CLOUD_API_PATH}{BenchmarkCloud.EVENTS_PATH}",
+            json=events,
+        ) as response:
+            response.raise_for_status()
+
+
+class BenchmarkCloud(FakeOverkizCloud):
+    """Fake cloud server, reporting the closure set by the executed commands.
+
+    Events are queued by the benchmark via an unauthenticated endpoint.
+    """
+
+    EVENTS_PATH = "benchmark/events"
+
+    def _routes(self) -> list[tuple[str, str, Any]]:
+        """Return the (method, path, handler) of the endpoints."""
+        return [*super()._routes(), ("POST", self.EVENTS_PATH, self._queue_events)]
+
+    def _is_authenticated(self, request: web.Request) -> bool:
+        """Return True if the request has a valid session cookie, or queues events."""
+        return request.path == f"{self.api_path}{self.EVENTS_PATH}" or (
+            super()._is_authenticated(request)
+        )
+
+    async def _queue_events(self, request: web.Request) -> web.Response:
+        self.events.extend(await request.json())
+        return web.json_response({})
+
+    async def _apply(self, request: web.Request) -> web.Response:
+        response = await super()._apply(request)
+
+        for action in (await request.json())["actions"]:
+            self.events.extend(
+                closure_event(action["deviceURL"], command["parameters"][0])
+                for command in action["commands"]
+                if command["name"] == "setClosure"
+            )
+
+        self.complete_executions()
+
+        return response
+
+
+async def async_serve(devices: int) -> None:
+    """Serve a fake cloud server of devices, and print its port once it listens."""
+    cloud = BenchmarkCloud(*synthetic_devices(devices))
+    runner = web.AppRunner(cloud.app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    print(runner.addresses[0][1], flush=True)
+
+    await asyncio.Event().wait()
+
+
+async def async_benchmark(devices: int, polls: int, commands: int) -> dict[str, Any]:
+    """Set up an installation with devices, and return its measurements."""
+    results: dict[str, Any] = {"devices": devices}
+
+    with FakeCloudProcess(devices) as server, tempfile.TemporaryDirectory() as config:
+        hass = await async_test_home_assistant(asyncio.get_running_loop())
+        hass.config.config_dir = config
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            version=2,
+            unique_id=TEST_GATEWAY_ID,
+            data={
+                "username": TEST_USERNAME,
+                "password": TEST_PASSWORD,
+                "hub": "benchmark",
+            },
+        )
+        entry.add_to_hass(hass)
+
+        with patch.dict(
+            SUPPORTED_SERVERS, {"benchmark": BenchmarkCloud.server(server.host)}
+        ):
+            started = time.perf_counter()
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            results["setup_seconds"] = time.perf_counter() - started
+
+        coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+        # The fake server does not limit requests
+        coordinator.rate_limiter.rate = float("inf")
+
+        poll_durations: list[float] = []
+        state_writes = 0
+        write_ha_state = Entity.async_write_ha_state
+
+        def counted_write_ha_state(entity: Entity) -> None:
+            nonlocal state_writes
+            state_writes += 1
+            write_ha_state(entity)
+
+        changed_device_urls = [
+            device_url(index) for index in range(0, devices, max(1, devices // 100))
+        ]
+
+        with patch.object(Entity, "async_write_ha_state", counted_write_ha_state):
+            async with ClientSession() as session:
+                for poll in range(polls):
+                    await server.async_queue_events(
+                        session,
+                        [closure_event(url, poll % 100) for url in changed_device_urls],
+                    )
+
+                    # Nothing else runs in this process meanwhile, except for the
+                    # executor threads of Home Assistant (included)
+                    started = time.process_time()
+                    await coordinator.async_refresh()
+                    await hass.async_block_till_done()
+                    poll_durations.append(time.process_time() - started)
+
+        results["poll_cpu_ms"] = statistics.median(poll_durations) * 1000
+        results["state_writes_per_event"] = state_writes / (
+            polls * len(changed_device_urls)
+        )
+
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "cover", DOMAIN, device_url(0)
+        )
+        latencies: list[float] = []
+
+        for position in range(commands):
+            written = asyncio.Event()
+
+            def on_state_changed(event: Any, position: int = position) -> None:
+                if (
+                    event.data["entity_id"] == entity_id
+                    and event.data["new_state"].attributes.get("current_position")
+                    == position
+                ):
+                    written.set()
+
+            remove_listener = hass.bus.async_listen(
+                EVENT_STATE_CHANGED, on_state_changed
+            )
+            started = time.perf_counter()
+            await hass.services.async_call(
+                "cover",
+                "set_cover_position",
+                {"entity_id": entity_id, "position": position},
+            )
+            await asyncio.wait_for(written.wait(), timeout=30)
+            latencies.append(time.perf_counter() - started)
+            remove_listener()
+
+        results["command_latency_ms"] = statistics.median(latencies) * 1000
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+
+    results["peak_memory_mib"] = (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    )
+
+    return results
+
+
+def measure(devices: int, polls: int, commands: int) -> dict[str, Any]:
+    """Return the measurements of an installation, in a new interpreter."""
+    return json.loads(
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                MODULE,
+                "--run",
+                str(devices),
+                "--polls",
+                str(polls),
+                "--commands",
+                str(commands),
+            ],
+            cwd=ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--devices", type=int, nargs="+", default=DEFAULT_DEVICES)
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--commands", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="JSON file of the results")
+    parser.add_argument("--run", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        asyncio.run(async_serve(args.serve))
+        return
+
+    if args.run:
+        logging.basicConfig(level=logging.WARNING)
+        results = asyncio.run(async_benchmark(args.run, args.polls, args.commands))
+        print(json.dumps(results))
+        return
+
+    manifest = json.loads((ROOT / "custom_components/tahoma/manifest.json").read_text())
+    report = {
+        "version": manifest["version"],
+        "python": platform.python_version(),
+        "note": NOTE,
+        "results": [],
+    }
+
+    print(
+        f"{'devices':>8} {'setup (s)':>10} {'poll CPU (ms)':>14} {'writes/event':>13} "
+        f"{'memory (MiB)':>13} {'command (ms)':>13}"
+    )
+
+    for devices in args.devices:
+        results = measure(devices, args.polls, args.commands)
+        report["results"].append(results)
+        print(
+            f"{devices:>8} {results['setup_seconds']:>10.2f} "
+            f"{results['poll_cpu_ms']:>14.2f} "
+            f"{results['state_writes_per_event']:>13.2f} "
+            f"{results['peak_memory_mib']:>13.1f} "
+            f"{results['command_latency_ms']:>13.0f}"
+        )
+
+    print(f"\n{NOTE}")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
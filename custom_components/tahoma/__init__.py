@@ -1,22 +1,34 @@
 """The Overkiz (by Somfy) integration."""
 from __future__ import annotations
 
-import asyncio
 from collections import defaultdict
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+import importlib
 import logging
+import time
+from types import ModuleType
+from typing import Any
 
-from aiohttp import ClientError, ServerDisconnectedError
+from aiohttp import ClientError, ClientSession, ServerDisconnectedError, TCPConnector
+from aiohttp.hdrs import USER_AGENT
+import humps
 from pyoverkiz.client import OverkizClient
 from pyoverkiz.const import SUPPORTED_SERVERS
+from pyoverkiz.enums import APIType
 from pyoverkiz.exceptions import (
     BadCredentialsException,
     InvalidCommandException,
     MaintenanceException,
+    NotAuthenticatedException,
     TooManyRequestsException,
 )
-from pyoverkiz.models import Command, Device, Scenario
+from pyoverkiz.models import Command, Device, Scenario, Setup
+from pyoverkiz.utils import generate_local_server
 import voluptuous as vol
+from yarl import URL
 
 from homeassistant.config_entries import (
     SOURCE_DHCP,
@@ -24,8 +36,17 @@ from homeassistant.config_entries import (
     SOURCE_ZEROCONF,
     ConfigEntry,
 )
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_TOKEN,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+    EVENT_HOMEASSISTANT_CLOSE,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import (
     config_validation as cv,
@@ -33,18 +54,36 @@ from homeassistant.helpers import (
     entity_registry as er,
     service,
 )
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.aiohttp_client import (
+    SERVER_SOFTWARE,
+    async_create_clientsession,
+)
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.json import json_dumps
+from homeassistant.helpers.storage import Store
+from homeassistant.util import ssl as ssl_util
 
+from . import api
 from .const import (
+    CONF_API_TYPE,
     CONF_HUB,
+    CONNECTION_KEEPALIVE,
+    DATA_CONNECTORS,
+    DEFINITION_PLATFORMS,
     DOMAIN,
     IGNORED_OVERKIZ_DEVICES,
     OVERKIZ_DEVICE_TO_PLATFORM,
-    SUPPORTED_PLATFORMS,
+    SESSION_STORAGE_KEY,
+    SIGNAL_DEVICES_ADDED,
+    STORAGE_KEY,
+    STORAGE_VERSION,
     UPDATE_INTERVAL,
     UPDATE_INTERVAL_ALL_ASSUMED_STATE,
+    UPDATE_INTERVAL_LOCAL,
 )
-from .coordinator import OverkizDataUpdateCoordinator
+from .coordinator import OverkizDataUpdateCoordinator, OverkizDefinitionIndex
+from .lazy_registry import LazyClassRegistry
+from .rate_limiter import OverkizRateLimiter, Priority
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -58,6 +97,7 @@ class HomeAssistantOverkizData:
     coordinator: OverkizDataUpdateCoordinator
     platforms: defaultdict[Platform, list[Device]]
     scenarios: list[Scenario]
+    loaded_platforms: set[Platform] = field(default_factory=set)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -72,43 +112,93 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
 
     # To allow users with multiple accounts/hubs, we create a new session so they have separate cookies
-    session = async_create_clientsession(hass)
+    session = async_create_client_session(hass)
+    entry.async_on_unload(session.detach)
     client = OverkizClient(
         username=username, password=password, session=session, server=server
     )
-
-    try:
-        await client.login()
-
-        tasks = [
-            client.get_setup(),
-            client.get_scenarios(),
-        ]
-        setup, scenarios = await asyncio.gather(*tasks)
-    except BadCredentialsException as exception:
-        raise ConfigEntryAuthFailed from exception
-    except TooManyRequestsException as exception:
-        raise ConfigEntryNotReady("Too many requests, try again later") from exception
-    except (TimeoutError, ClientError, ServerDisconnectedError) as exception:
-        raise ConfigEntryNotReady("Failed to connect") from exception
-    except MaintenanceException as exception:
-        raise ConfigEntryNotReady("Server is down for maintenance") from exception
-    except Exception as exception:  # pylint: disable=broad-except
-        _LOGGER.exception(exception)
-        return False
+    fallback_client = None
+    update_interval = UPDATE_INTERVAL
+
+    # The local API is used when available, with the cloud API as fallback
+    if entry.data.get(CONF_API_TYPE) == APIType.LOCAL:
+        fallback_client = client
+        local_session = async_create_client_session(hass, entry.data[CONF_VERIFY_SSL])
+        entry.async_on_unload(local_session.detach)
+        client = create_local_client(
+            hass,
+            entry.data[CONF_HOST],
+            entry.data[CONF_TOKEN],
+            entry.data[CONF_VERIFY_SSL],
+            local_session,
+        )
+        update_interval = UPDATE_INTERVAL_LOCAL
+
+    # Entities are set up from the last known setup if available, which is
+    # reconciled with the live setup once logged in
+    store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id))
+    snapshot = await store.async_load()
+    warm_start = snapshot is not None
+
+    # The session of the last run is reused, since logins are heavily rate limited
+    session_store = create_session_store(hass, entry)
+    session_restored = restore_session(client, await session_store.async_load())
+
+    if not warm_start:
+        try:
+            snapshot = await async_login_and_get_snapshot(client, session_restored)
+        except BadCredentialsException as exception:
+            raise ConfigEntryAuthFailed from exception
+        except TooManyRequestsException as exception:
+            raise ConfigEntryNotReady(
+                "Too many requests, try again later"
+            ) from exception
+        except (TimeoutError, ClientError, ServerDisconnectedError) as exception:
+            raise ConfigEntryNotReady("Failed to connect") from exception
+        except MaintenanceException as exception:
+            raise ConfigEntryNotReady("Server is down for maintenance") from exception
+        except Exception as exception:  # pylint: disable=broad-except
+            _LOGGER.exception(exception)
+            return False
+
+        await store.async_save(snapshot)
+
+    started = time.monotonic()
+    setup, scenarios = await hass.async_add_executor_job(parse_snapshot, snapshot)
+    setup_parse_duration = time.monotonic() - started
+    _LOGGER.debug(
+        "Parsed setup with %s devices in %.3fs",
+        len(setup.devices),
+        setup_parse_duration,
+    )
 
     coordinator = OverkizDataUpdateCoordinator(
         hass,
         _LOGGER,
         name="device events",
         client=client,
+        fallback_client=fallback_client,
         devices=setup.devices,
         places=setup.root_place,
-        update_interval=UPDATE_INTERVAL,
+        update_interval=update_interval,
+        max_update_interval=update_interval,
         config_entry_id=entry.entry_id,
     )
+    coordinator.parse_durations["setup"] = setup_parse_duration
 
-    await coordinator.async_config_entry_first_refresh()
+    if warm_start:
+        coordinator.async_set_updated_data(coordinator.devices)
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
+    entry.async_on_unload(coordinator.async_shutdown)
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP,
+            partial(async_save_session, hass, entry, coordinator.primary_client),
+        )
+    )
 
     if coordinator.is_stateless:
         _LOGGER.debug(
@@ -117,27 +207,35 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
         coordinator.update_interval = UPDATE_INTERVAL_ALL_ASSUMED_STATE
 
-    platforms: defaultdict[Platform, list[Device]] = defaultdict(list)
-
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = HomeAssistantOverkizData(
-        coordinator=coordinator, platforms=platforms, scenarios=scenarios
-    )
-
-    # Map Overkiz device to Home Assistant platform
-    for device in coordinator.data.values():
-        platform = OVERKIZ_DEVICE_TO_PLATFORM.get(
-            device.widget
-        ) or OVERKIZ_DEVICE_TO_PLATFORM.get(device.ui_class)
-        if platform:
-            platforms[platform].append(device)
-            log_device("Added device", device)
-        elif (
-            device.widget not in IGNORED_OVERKIZ_DEVICES
-            and device.ui_class not in IGNORED_OVERKIZ_DEVICES
-        ):
-            log_device("Unsupported device detected", device)
+    await async_setup_platforms(hass, entry, coordinator, scenarios)
+
+    async def async_reconcile_snapshot() -> None:
+        """Log in and reconcile the stored setup with the live setup."""
+        try:
+            live_snapshot = await async_login_and_get_snapshot(
+                client, session_restored, coordinator.rate_limiter
+            )
+        except BadCredentialsException:
+            entry.async_start_reauth(hass)
+            return
+        except Exception as exception:  # pylint: disable=broad-except
+            # The coordinator will log in again on its next update
+            _LOGGER.warning(
+                "Failed to retrieve setup, using stored setup: %s", exception
+            )
+            return
+
+        await store.async_save(live_snapshot)
+
+        live_setup, _ = await hass.async_add_executor_job(parse_snapshot, live_snapshot)
+        await coordinator.async_reconcile_devices(
+            live_setup.devices, live_setup.root_place
+        )
+        await coordinator.async_refresh()
 
-    await hass.config_entries.async_forward_entry_setups(entry, SUPPORTED_PLATFORMS)
+    if warm_start:
+        reconcile_task = hass.async_create_task(async_reconcile_snapshot())
+        entry.async_on_unload(reconcile_task.cancel)
 
     device_registry = dr.async_get(hass)
 
@@ -162,7 +260,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             entity = entity_registry.entities.get(entity_id)
 
             try:
-                await coordinator.client.execute_command(
+                await coordinator.rate_limiter.async_call(
+                    Priority.COMMAND,
+                    coordinator.client.execute_command,
                     entity.unique_id,
                     Command(call.data.get("command"), call.data.get("args")),
                     "Home Assistant Service",
@@ -188,7 +288,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     async def handle_get_execution_history(call):
         """Handle get execution history service."""
-        await write_execution_history_to_log(coordinator.client)
+        await write_execution_history_to_log(coordinator)
 
     service.async_register_admin_service(
         hass,
@@ -200,27 +300,397 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_setup_platforms(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: OverkizDataUpdateCoordinator,
+    scenarios: list[Scenario],
+) -> None:
+    """Set up the platforms with entities, and platforms needed later on."""
+    platforms: defaultdict[Platform, list[Device]] = defaultdict(list)
+
+    data = HomeAssistantOverkizData(
+        coordinator=coordinator, platforms=platforms, scenarios=scenarios
+    )
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = data
+
+    map_devices_to_platforms(coordinator.data.values(), platforms)
+
+    # Imported once in the executor, since importing blocks the event loop
+    definition_platforms = await hass.async_add_executor_job(
+        import_definition_platforms
+    )
+
+    @callback
+    def async_devices_added(devices: list[Device]) -> None:
+        """Map created or updated devices to their platform."""
+        device_urls = {device.device_url for device in devices}
+
+        for platform_devices in platforms.values():
+            platform_devices[:] = [
+                device
+                for device in platform_devices
+                if device.device_url not in device_urls
+            ]
+
+        map_devices_to_platforms(devices, platforms)
+
+        # Set up platforms which were not needed before
+        if new_platforms := (
+            get_needed_platforms(
+                platforms, OverkizDefinitionIndex(devices), definition_platforms
+            )
+            - data.loaded_platforms
+        ):
+            data.loaded_platforms |= new_platforms
+            entry.async_create_task(
+                hass,
+                hass.config_entries.async_forward_entry_setups(entry, new_platforms),
+            )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), async_devices_added
+        )
+    )
+
+    # Only platforms with entities are set up, which avoids importing them
+    data.loaded_platforms = get_needed_platforms(
+        platforms, coordinator.definition_index, definition_platforms
+    )
+
+    if scenarios:
+        data.loaded_platforms.add(Platform.SCENE)
+
+    await hass.config_entries.async_forward_entry_setups(entry, data.loaded_platforms)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored setup and session of a config entry."""
+    await Store(
+        hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id)
+    ).async_remove()
+    await create_session_store(hass, entry).async_remove()
+
+
+def create_session_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Create the store of the authenticated session of a config entry."""
+    return Store(
+        hass,
+        STORAGE_VERSION,
+        SESSION_STORAGE_KEY.format(entry.entry_id),
+        private=True,
+    )
+
+
+async def async_save_session(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    client: OverkizClient,
+    _: Event | None = None,
+) -> None:
+    """Store the authenticated session of a client, to be reused on the next start."""
+    await create_session_store(hass, entry).async_save(session_to_dict(client))
+
+
+def session_to_dict(client: OverkizClient) -> dict[str, Any]:
+    """Return the authenticated session of a client, to be stored."""
+    cookies = client.session.cookie_jar.filter_cookies(URL(client.server.endpoint))
+    # pylint: disable=protected-access
+    expires_in = client._expires_in
+
+    return {
+        "username": client.username,
+        "cookies": {name: morsel.value for name, morsel in cookies.items()},
+        "event_listener_id": client.event_listener_id,
+        # Tokens are only issued by the Somfy (Europe) cloud API
+        "access_token": client._access_token
+        if client.api_type == APIType.CLOUD
+        else None,
+        "refresh_token": client._refresh_token,
+        "expires_in": expires_in.isoformat() if expires_in else None,
+    }
+
+
+def restore_session(client: OverkizClient, session: dict[str, Any] | None) -> bool:
+    """Restore a stored session of a client, return True if there was one."""
+    # The session of another account (e.g. after a reauth) can't be used
+    if (
+        not session
+        or session["username"] != client.username
+        or not (
+            session["cookies"]
+            or session["access_token"]
+            or session["event_listener_id"]
+        )
+    ):
+        return False
+
+    client.session.cookie_jar.update_cookies(
+        session["cookies"], URL(client.server.endpoint)
+    )
+    client.event_listener_id = session["event_listener_id"]
+
+    if session["access_token"]:
+        # pylint: disable=protected-access
+        client._access_token = session["access_token"]
+        client._refresh_token = session["refresh_token"]
+        client._expires_in = (
+            datetime.fromisoformat(session["expires_in"])
+            if session["expires_in"]
+            else None
+        )
+
+    return True
+
+
+@callback
+def async_get_connector(hass: HomeAssistant, verify_ssl: bool = True) -> TCPConnector:
+    """Return the connection pool shared by all config entries."""
+    connectors: dict[bool, TCPConnector] = hass.data.setdefault(DATA_CONNECTORS, {})
+
+    if verify_ssl not in connectors:
+        connector = connectors[verify_ssl] = TCPConnector(
+            enable_cleanup_closed=True,
+            keepalive_timeout=CONNECTION_KEEPALIVE.total_seconds(),
+            ssl=ssl_util.client_context() if verify_ssl else False,
+        )
+
+        async def async_close_connector(_: Event) -> None:
+            """Close the connection pool."""
+            await connector.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, async_close_connector)
+
+    return connectors[verify_ssl]
+
+
+@callback
+def async_create_client_session(
+    hass: HomeAssistant, verify_ssl: bool = True
+) -> ClientSession:
+    """Create a session with its own cookies, using the shared connection pool.
+
+    The session needs to be detached when it is not used anymore.
+    """
+    return ClientSession(
+        connector=async_get_connector(hass, verify_ssl),
+        connector_owner=False,
+        headers={USER_AGENT: SERVER_SOFTWARE},
+        json_serialize=json_dumps,
+    )
+
+
+def create_local_client(
+    hass: HomeAssistant,
+    host: str,
+    token: str,
+    verify_ssl: bool,
+    session: ClientSession | None = None,
+) -> OverkizClient:
+    """Create a client for the local API of a gateway (developer mode)."""
+    return OverkizClient(
+        username="",
+        password="",
+        token=token,
+        session=session or async_create_clientsession(hass, verify_ssl=verify_ssl),
+        server=generate_local_server(host=host),
+        verify_ssl=verify_ssl,
+    )
+
+
+async def async_get_snapshot(client: OverkizClient) -> dict[str, Any]:
+    """Retrieve the setup and scenarios as they are returned by the API."""
+    # pyoverkiz only returns parsed models, which can't be serialized again
+    setup = await api.get_raw_setup(client)
+
+    # Scenarios are not available via the local API
+    scenarios = (
+        [] if client.api_type == APIType.LOCAL else await api.get_raw_scenarios(client)
+    )
+
+    # The location (address) of the setup is not used, thus not stored
+    setup.pop("location", None)
+
+    return {"setup": setup, "scenarios": scenarios}
+
+
+async def async_login_and_get_snapshot(
+    client: OverkizClient,
+    session_restored: bool,
+    rate_limiter: OverkizRateLimiter | None = None,
+) -> dict[str, Any]:
+    """Retrieve the snapshot, logging in unless the restored session is valid."""
+
+    async def call(function: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        if rate_limiter is None:
+            return await function(*args)
+
+        return await rate_limiter.async_call_once(Priority.POLLING, function, *args)
+
+    if session_restored:
+        try:
+            return await call(async_get_snapshot, client)
+        except NotAuthenticatedException:
+            _LOGGER.debug("Stored session has expired, logging in")
+
+    await call(client.login)
+
+    return await call(async_get_snapshot, client)
+
+
+def parse_snapshot(snapshot: dict[str, Any]) -> tuple[Setup, list[Scenario]]:
+    """Parse the setup and scenarios of a snapshot, to be run in the executor."""
+    return Setup(**humps.decamelize(snapshot["setup"])), [
+        Scenario(**scenario) for scenario in snapshot["scenarios"]
+    ]
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
+    data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
     unload_ok = await hass.config_entries.async_unload_platforms(
-        entry, SUPPORTED_PLATFORMS
+        entry, data.loaded_platforms
     )
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        await async_save_session(hass, entry, data.coordinator.primary_client)
 
     return unload_ok
 
 
-async def write_execution_history_to_log(client: OverkizClient):
+async def write_execution_history_to_log(coordinator: OverkizDataUpdateCoordinator):
     """Retrieve execution history and write output to log."""
-    history = await client.get_execution_history()
+    history = await coordinator.rate_limiter.async_call(
+        Priority.DIAGNOSTICS, coordinator.client.get_execution_history
+    )
 
     for item in history:
         _LOGGER.info(item)
 
 
+def get_device_platform(device: Device) -> Platform | None:
+    """Return the Home Assistant platform of an Overkiz device."""
+    return OVERKIZ_DEVICE_TO_PLATFORM.get(
+        device.widget
+    ) or OVERKIZ_DEVICE_TO_PLATFORM.get(device.ui_class)
+
+
+def import_definition_platforms() -> dict[Platform, ModuleType]:
+    """Import the platforms based on the device definitions, to be run in the executor."""
+    return {
+        platform: importlib.import_module(f"{__name__}.{platform}")
+        for platform in DEFINITION_PLATFORMS
+    }
+
+
+def get_needed_platforms(
+    platforms: dict[Platform, list[Device]],
+    index: OverkizDefinitionIndex,
+    definition_platforms: dict[Platform, ModuleType],
+) -> set[Platform]:
+    """Return the platforms with entities for the mapped and indexed devices."""
+    needed_platforms = {platform for platform, devices in platforms.items() if devices}
+
+    # Platforms based on the device definitions know which keys they support
+    for platform, module in definition_platforms.items():
+        if module.has_entities(index):
+            needed_platforms.add(platform)
+
+    return needed_platforms
+
+
+def map_devices_to_platforms(
+    devices: Iterable[Device], platforms: defaultdict[Platform, list[Device]]
+) -> None:
+    """Map Overkiz devices to Home Assistant platforms."""
+    for device in devices:
+        if platform := get_device_platform(device):
+            platforms[platform].append(device)
+            log_device("Added device", device)
+        elif (
+            device.widget not in IGNORED_OVERKIZ_DEVICES
+            and device.ui_class not in IGNORED_OVERKIZ_DEVICES
+        ):
+            log_device("Unsupported device detected", device)
+
+
+@callback
+def async_setup_device_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    platform: Platform,
+    add_device_entities: Callable[[list[Device]], None],
+    registry: LazyClassRegistry | None = None,
+) -> None:
+    """Add entities for current devices and for devices added later on.
+
+    Only the devices mapped to this platform are passed to add_device_entities.
+    The entity classes of the current devices must have been loaded from the
+    registry, while those of devices added later on are loaded here.
+    """
+    data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
+
+    add_device_entities(data.platforms[platform])
+
+    async def async_load_and_add(devices: list[Device]) -> None:
+        """Load the entity classes of the devices, and add their entities."""
+        assert registry is not None
+        await registry.async_load(hass, (device.widget for device in devices))
+        add_device_entities(devices)
+
+    @callback
+    def async_devices_added(devices: list[Device]) -> None:
+        """Add entities for created or updated devices."""
+        devices = [
+            device for device in devices if get_device_platform(device) == platform
+        ]
+
+        if not devices:
+            return
+
+        if registry is None:
+            add_device_entities(devices)
+        else:
+            entry.async_create_task(hass, async_load_and_add(devices))
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), async_devices_added
+        )
+    )
+
+
+@callback
+def async_setup_definition_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    add_definition_entities: Callable[[OverkizDefinitionIndex], None],
+) -> None:
+    """Add entities based on the device definitions (e.g. sensors per state).
+
+    The definition index of the coordinator is passed to add_definition_entities,
+    which is shared by all platforms. Devices added later on are passed via an
+    index of these devices only.
+    """
+    data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
+
+    add_definition_entities(data.coordinator.definition_index)
+
+    @callback
+    def async_devices_added(devices: list[Device]) -> None:
+        """Add entities for created or updated devices."""
+        add_definition_entities(OverkizDefinitionIndex(devices))
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), async_devices_added
+        )
+    )
+
+
 def log_device(message: str, device: Device) -> None:
     """Log device information."""
     _LOGGER.debug("%s (%s)", message, device)
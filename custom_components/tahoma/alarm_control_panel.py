@@ -1,12 +1,14 @@
 """Support for Overkiz Alarms."""
 from __future__ import annotations
 
+from pyoverkiz.models import Device
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeAssistantOverkizData
+from . import HomeAssistantOverkizData, async_setup_device_entities
 from .alarm_entities import WIDGET_TO_ALARM_ENTITY
 from .const import DOMAIN
 
@@ -19,10 +21,24 @@ async def async_setup_entry(
     """Set up the Overkiz alarm control panel from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
 
-    entities = [
-        WIDGET_TO_ALARM_ENTITY[device.widget](device.device_url, data.coordinator)
-        for device in data.platforms[Platform.ALARM_CONTROL_PANEL]
-        if device.widget in WIDGET_TO_ALARM_ENTITY
-    ]
+    @callback
+    def async_add_alarm_control_panels(devices: list[Device]) -> None:
+        """Add Overkiz alarm control panels for the given devices."""
+        entities = [
+            WIDGET_TO_ALARM_ENTITY[device.widget](device.device_url, data.coordinator)
+            for device in devices
+            if device.widget in WIDGET_TO_ALARM_ENTITY
+        ]
+
+        async_add_entities(entities)
 
-    async_add_entities(entities)
+    await WIDGET_TO_ALARM_ENTITY.async_load(
+        hass, (device.widget for device in data.platforms[Platform.ALARM_CONTROL_PANEL])
+    )
+    async_setup_device_entities(
+        hass,
+        entry,
+        Platform.ALARM_CONTROL_PANEL,
+        async_add_alarm_control_panels,
+        WIDGET_TO_ALARM_ENTITY,
+    )
@@ -1,14 +1,26 @@
 """Alarm Control Panel entities."""
 from pyoverkiz.enums.ui import UIWidget
 
-from .alarm_panel_controller import AlarmPanelController
-from .my_fox_alarm_controller import MyFoxAlarmController
-from .stateful_alarm_controller import StatefulAlarmController
-from .tsk_alarm_controller import TSKAlarmController
+from homeassistant.components.alarm_control_panel import AlarmControlPanelEntity
 
-WIDGET_TO_ALARM_ENTITY = {
-    UIWidget.TSKALARM_CONTROLLER: TSKAlarmController,
-    UIWidget.STATEFUL_ALARM_CONTROLLER: StatefulAlarmController,
-    UIWidget.ALARM_PANEL_CONTROLLER: AlarmPanelController,
-    UIWidget.MY_FOX_ALARM_CONTROLLER: MyFoxAlarmController,
-}
+from ..lazy_registry import LazyClassRegistry
+
+# Implementations are imported the first time a device of the widget is seen
+WIDGET_TO_ALARM_ENTITY: LazyClassRegistry[AlarmControlPanelEntity] = LazyClassRegistry(
+    __name__,
+    {
+        UIWidget.TSKALARM_CONTROLLER: ("tsk_alarm_controller", "TSKAlarmController"),
+        UIWidget.STATEFUL_ALARM_CONTROLLER: (
+            "stateful_alarm_controller",
+            "StatefulAlarmController",
+        ),
+        UIWidget.ALARM_PANEL_CONTROLLER: (
+            "alarm_panel_controller",
+            "AlarmPanelController",
+        ),
+        UIWidget.MY_FOX_ALARM_CONTROLLER: (
+            "my_fox_alarm_controller",
+            "MyFoxAlarmController",
+        ),
+    },
+)
@@ -0,0 +1,80 @@
+"""Overkiz API endpoints which are not exposed by pyoverkiz.
+
+pyoverkiz only returns parsed models, and only executes commands of a single
+device. These endpoints return the raw responses (e.g. to store or filter them
+before parsing), with the same relogin and retry as the pyoverkiz endpoints.
+"""
+from __future__ import annotations
+
+from typing import Any, cast
+from urllib.parse import quote_plus
+
+from aiohttp import ClientConnectorError, ServerDisconnectedError
+import backoff
+from pyoverkiz.client import OverkizClient, relogin
+from pyoverkiz.exceptions import NotAuthenticatedException
+from pyoverkiz.models import Command
+
+_retry_after_relogin = backoff.on_exception(
+    backoff.expo,
+    (NotAuthenticatedException, ServerDisconnectedError, ClientConnectorError),
+    max_tries=2,
+    on_backoff=relogin,
+)
+
+
+async def _get(client: OverkizClient, path: str) -> Any:
+    """Make a GET request to the Overkiz API."""
+    return await client._OverkizClient__get(path)  # pylint: disable=protected-access
+
+
+async def _post(client: OverkizClient, path: str, payload: dict[str, Any]) -> Any:
+    """Make a POST request to the Overkiz API."""
+    # pylint: disable=protected-access
+    return await client._OverkizClient__post(path, payload)
+
+
+@_retry_after_relogin
+async def get_raw_setup(client: OverkizClient) -> dict[str, Any]:
+    """Return the setup, with its gateways, devices and places."""
+    return cast(dict[str, Any], await _get(client, "setup"))
+
+
+@_retry_after_relogin
+async def get_raw_scenarios(client: OverkizClient) -> list[dict[str, Any]]:
+    """Return the scenarios (action groups), which the local API does not serve."""
+    return cast(list[dict[str, Any]], await _get(client, "actionGroups"))
+
+
+@_retry_after_relogin
+async def get_raw_devices(client: OverkizClient) -> list[dict[str, Any]]:
+    """Return all devices with their states."""
+    return cast(list[dict[str, Any]], await _get(client, "setup/devices"))
+
+
+@_retry_after_relogin
+async def get_raw_device(client: OverkizClient, device_url: str) -> dict[str, Any]:
+    """Return a device with its states."""
+    return cast(
+        dict[str, Any], await _get(client, f"setup/devices/{quote_plus(device_url)}")
+    )
+
+
+@_retry_after_relogin
+async def execute_action_group(
+    client: OverkizClient, commands: dict[str, list[Command]], label: str
+) -> str:
+    """Execute the commands of multiple devices in a single action group."""
+    response = await _post(
+        client,
+        "exec/apply",
+        {
+            "label": label,
+            "actions": [
+                {"deviceURL": device_url, "commands": device_commands}
+                for device_url, device_commands in commands.items()
+            ],
+        },
+    )
+
+    return cast(str, response["execId"])
@@ -14,11 +14,12 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeAssistantOverkizData
-from .const import DOMAIN, IGNORED_OVERKIZ_DEVICES
+from . import HomeAssistantOverkizData, async_setup_definition_entities
+from .const import DOMAIN
+from .coordinator import OverkizDefinitionIndex
 from .entity import OverkizDescriptiveEntity
 
 
@@ -130,6 +131,11 @@ SUPPORTED_STATES = {
 }
 
 
+def has_entities(index: OverkizDefinitionIndex) -> bool:
+    """Return True if one of the indexed devices has a binary sensor."""
+    return any(index.with_state(state_name) for state_name in SUPPORTED_STATES)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -137,26 +143,17 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Overkiz binary sensors from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
-    entities: list[OverkizBinarySensor] = []
-
-    for device in data.coordinator.data.values():
-        if (
-            device.widget in IGNORED_OVERKIZ_DEVICES
-            or device.ui_class in IGNORED_OVERKIZ_DEVICES
-        ):
-            continue
-
-        for state in device.definition.states:
-            if description := SUPPORTED_STATES.get(state.qualified_name):
-                entities.append(
-                    OverkizBinarySensor(
-                        device.device_url,
-                        data.coordinator,
-                        description,
-                    )
-                )
-
-    async_add_entities(entities)
+
+    @callback
+    def async_add_binary_sensors(index: OverkizDefinitionIndex) -> None:
+        """Add Overkiz binary sensors for the indexed devices."""
+        async_add_entities(
+            OverkizBinarySensor(device_url, data.coordinator, description)
+            for state_name, description in SUPPORTED_STATES.items()
+            for device_url in index.with_state(state_name)
+        )
+
+    async_setup_definition_entities(hass, entry, async_add_binary_sensors)
 
 
 class OverkizBinarySensor(OverkizDescriptiveEntity, BinarySensorEntity):
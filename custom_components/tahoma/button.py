@@ -3,12 +3,13 @@ from __future__ import annotations
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeAssistantOverkizData
-from .const import DOMAIN, IGNORED_OVERKIZ_DEVICES
+from . import HomeAssistantOverkizData, async_setup_definition_entities
+from .const import DOMAIN
+from .coordinator import OverkizDefinitionIndex
 from .entity import OverkizDescriptiveEntity
 
 BUTTON_DESCRIPTIONS: list[ButtonEntityDescription] = [
@@ -53,6 +54,11 @@ SUPPORTED_COMMANDS = {
 }
 
 
+def has_entities(index: OverkizDefinitionIndex) -> bool:
+    """Return True if one of the indexed devices has a button."""
+    return any(index.with_command(command) for command in SUPPORTED_COMMANDS)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -60,26 +66,17 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Overkiz button from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
-    entities: list[ButtonEntity] = []
-
-    for device in data.coordinator.data.values():
-        if (
-            device.widget in IGNORED_OVERKIZ_DEVICES
-            or device.ui_class in IGNORED_OVERKIZ_DEVICES
-        ):
-            continue
 
-        for command in device.definition.commands:
-            if description := SUPPORTED_COMMANDS.get(command.command_name):
-                entities.append(
-                    OverkizButton(
-                        device.device_url,
-                        data.coordinator,
-                        description,
-                    )
-                )
+    @callback
+    def async_add_buttons(index: OverkizDefinitionIndex) -> None:
+        """Add Overkiz buttons for the indexed devices."""
+        async_add_entities(
+            OverkizButton(device_url, data.coordinator, description)
+            for command_name, description in SUPPORTED_COMMANDS.items()
+            for device_url in index.with_command(command_name)
+        )
 
-    async_add_entities(entities)
+    async_setup_definition_entities(hass, entry, async_add_buttons)
 
 
 class OverkizButton(OverkizDescriptiveEntity, ButtonEntity):
@@ -1,56 +1,67 @@
 """Support for Overkiz climate devices."""
 from pyoverkiz.enums import UIWidget
+from pyoverkiz.models import Device
 
+from homeassistant.components.climate import ClimateEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeAssistantOverkizData
-from .climate_devices.atlantic_electrical_heater import AtlanticElectricalHeater
-from .climate_devices.atlantic_electrical_heater_with_adjustable_temperature_setpoint import (
-    AtlanticElectricalHeaterWithAdjustableTemperatureSetpoint,
-)
-from .climate_devices.atlantic_electrical_towel_dryer import (
-    AtlanticElectricalTowelDryer,
-)
-from .climate_devices.atlantic_heat_recovery_ventilation import (
-    AtlanticHeatRecoveryVentilation,
-)
-from .climate_devices.atlantic_pass_apc_heating_and_cooling_zone import (
-    AtlanticPassAPCHeatingAndCoolingZone,
-)
-from .climate_devices.atlantic_pass_apc_zone_control import AtlanticPassAPCZoneControl
-from .climate_devices.atlantic_pass_apcdhw import AtlanticPassAPCDHW
-from .climate_devices.dimmer_exterior_heating import DimmerExteriorHeating
-from .climate_devices.evo_home_controller import EvoHomeController
-from .climate_devices.heating_set_point import HeatingSetPoint
-from .climate_devices.hitachi_air_to_air_heat_pump import HitachiAirToAirHeatPump
-from .climate_devices.hitachi_air_to_water_heating_zone import (
-    HitachiAirToWaterHeatingZone,
-)
-from .climate_devices.somfy_heating_temperature_interface import (
-    SomfyHeatingTemperatureInterface,
-)
-from .climate_devices.somfy_thermostat import SomfyThermostat
+from . import HomeAssistantOverkizData, async_setup_device_entities
 from .const import DOMAIN
+from .lazy_registry import LazyClassRegistry
 
-TYPE = {
-    UIWidget.ATLANTIC_ELECTRICAL_HEATER: AtlanticElectricalHeater,
-    UIWidget.ATLANTIC_ELECTRICAL_HEATER_WITH_ADJUSTABLE_TEMPERATURE_SETPOINT: AtlanticElectricalHeaterWithAdjustableTemperatureSetpoint,
-    UIWidget.ATLANTIC_ELECTRICAL_TOWEL_DRYER: AtlanticElectricalTowelDryer,
-    UIWidget.ATLANTIC_HEAT_RECOVERY_VENTILATION: AtlanticHeatRecoveryVentilation,
-    UIWidget.ATLANTIC_PASS_APC_DHW: AtlanticPassAPCDHW,
-    UIWidget.ATLANTIC_PASS_APC_HEATING_AND_COOLING_ZONE: AtlanticPassAPCHeatingAndCoolingZone,
-    UIWidget.ATLANTIC_PASS_APC_ZONE_CONTROL: AtlanticPassAPCZoneControl,
-    UIWidget.DIMMER_EXTERIOR_HEATING: DimmerExteriorHeating,
-    UIWidget.EVO_HOME_CONTROLLER: EvoHomeController,
-    UIWidget.HEATING_SET_POINT: HeatingSetPoint,
-    UIWidget.HITACHI_AIR_TO_AIR_HEAT_PUMP: HitachiAirToAirHeatPump,
-    UIWidget.HITACHI_AIR_TO_WATER_HEATING_ZONE: HitachiAirToWaterHeatingZone,
-    UIWidget.SOMFY_HEATING_TEMPERATURE_INTERFACE: SomfyHeatingTemperatureInterface,
-    UIWidget.SOMFY_THERMOSTAT: SomfyThermostat,
-}
+# Implementations are imported the first time a device of the widget is seen
+TYPE: LazyClassRegistry[ClimateEntity] = LazyClassRegistry(
+    f"{__package__}.climate_devices",
+    {
+        UIWidget.ATLANTIC_ELECTRICAL_HEATER: (
+            "atlantic_electrical_heater",
+            "AtlanticElectricalHeater",
+        ),
+        UIWidget.ATLANTIC_ELECTRICAL_HEATER_WITH_ADJUSTABLE_TEMPERATURE_SETPOINT: (
+            "atlantic_electrical_heater_with_adjustable_temperature_setpoint",
+            "AtlanticElectricalHeaterWithAdjustableTemperatureSetpoint",
+        ),
+        UIWidget.ATLANTIC_ELECTRICAL_TOWEL_DRYER: (
+            "atlantic_electrical_towel_dryer",
+            "AtlanticElectricalTowelDryer",
+        ),
+        UIWidget.ATLANTIC_HEAT_RECOVERY_VENTILATION: (
+            "atlantic_heat_recovery_ventilation",
+            "AtlanticHeatRecoveryVentilation",
+        ),
+        UIWidget.ATLANTIC_PASS_APC_DHW: ("atlantic_pass_apcdhw", "AtlanticPassAPCDHW"),
+        UIWidget.ATLANTIC_PASS_APC_HEATING_AND_COOLING_ZONE: (
+            "atlantic_pass_apc_heating_and_cooling_zone",
+            "AtlanticPassAPCHeatingAndCoolingZone",
+        ),
+        UIWidget.ATLANTIC_PASS_APC_ZONE_CONTROL: (
+            "atlantic_pass_apc_zone_control",
+            "AtlanticPassAPCZoneControl",
+        ),
+        UIWidget.DIMMER_EXTERIOR_HEATING: (
+            "dimmer_exterior_heating",
+            "DimmerExteriorHeating",
+        ),
+        UIWidget.EVO_HOME_CONTROLLER: ("evo_home_controller", "EvoHomeController"),
+        UIWidget.HEATING_SET_POINT: ("heating_set_point", "HeatingSetPoint"),
+        UIWidget.HITACHI_AIR_TO_AIR_HEAT_PUMP: (
+            "hitachi_air_to_air_heat_pump",
+            "HitachiAirToAirHeatPump",
+        ),
+        UIWidget.HITACHI_AIR_TO_WATER_HEATING_ZONE: (
+            "hitachi_air_to_water_heating_zone",
+            "HitachiAirToWaterHeatingZone",
+        ),
+        UIWidget.SOMFY_HEATING_TEMPERATURE_INTERFACE: (
+            "somfy_heating_temperature_interface",
+            "SomfyHeatingTemperatureInterface",
+        ),
+        UIWidget.SOMFY_THERMOSTAT: ("somfy_thermostat", "SomfyThermostat"),
+    },
+)
 
 
 async def async_setup_entry(
@@ -61,11 +72,17 @@ async def async_setup_entry(
     """Set up the Overkiz climate from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
 
-    climate_devices = [device for device in data.platforms[Platform.CLIMATE]]
+    @callback
+    def async_add_climates(devices: list[Device]) -> None:
+        """Add Overkiz climate entities for the given devices."""
+        entities = [
+            TYPE[device.widget](device.device_url, data.coordinator)
+            for device in devices
+            if device.widget in TYPE
+        ]
+        async_add_entities(entities)
 
-    entities = [
-        TYPE[device.widget](device.device_url, data.coordinator)
-        for device in climate_devices
-        if device.widget in TYPE
-    ]
-    async_add_entities(entities)
+    await TYPE.async_load(
+        hass, (device.widget for device in data.platforms[Platform.CLIMATE])
+    )
+    async_setup_device_entities(hass, entry, Platform.CLIMATE, async_add_climates, TYPE)
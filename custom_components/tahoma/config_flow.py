@@ -6,7 +6,8 @@ from typing import Any, cast
 
 from aiohttp import ClientError
 from pyoverkiz.client import OverkizClient
-from pyoverkiz.const import SUPPORTED_SERVERS
+from pyoverkiz.const import SERVERS_WITH_LOCAL_API, SUPPORTED_SERVERS
+from pyoverkiz.enums import APIType
 from pyoverkiz.exceptions import (
     BadCredentialsException,
     MaintenanceException,
@@ -18,11 +19,18 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.components import dhcp, zeroconf
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_TOKEN,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+)
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import CONF_HUB, DEFAULT_HUB, DOMAIN
+from . import create_local_client
+from .const import CONF_API_TYPE, CONF_HUB, DEFAULT_HUB, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,6 +43,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     _config_entry: ConfigEntry | None
     _default_user: None | str
     _default_hub: str
+    _default_api_type: APIType
+    _client: OverkizClient | None
+    _local_token: str | None
+    _user_input: dict[str, Any]
 
     def __init__(self) -> None:
         """Initialize Overkiz Config Flow."""
@@ -43,6 +55,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._config_entry = None
         self._default_user = None
         self._default_hub = DEFAULT_HUB
+        self._default_api_type = APIType.CLOUD
+        self._client = None
+        self._local_token = None
+        self._user_input = {}
 
     async def async_validate_input(self, user_input: dict[str, Any]) -> None:
         """Validate user credentials."""
@@ -56,12 +72,43 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         await client.login()
+        self._client = client
 
         # Set first gateway id as unique id
         if gateways := await client.get_gateways():
             gateway_id = gateways[0].id
             await self.async_set_unique_id(gateway_id)
 
+    async def async_create_local_token(self) -> str:
+        """Generate and activate a token for the local API of the gateway.
+
+        The token is created once per flow, since every activated token stays
+        on the account of the user, also when the form is submitted again.
+        """
+        assert self._client and self.unique_id
+
+        if self._local_token is None:
+            token = await self._client.generate_local_token(self.unique_id)
+            await self._client.activate_local_token(
+                gateway_id=self.unique_id,
+                token=token,
+                label=f"Home Assistant/{self.hass.config.location_name}",
+            )
+            self._local_token = token
+
+        return self._local_token
+
+    async def async_validate_local_input(self, user_input: dict[str, Any]) -> None:
+        """Validate the connection with the local API of the gateway."""
+        client = create_local_client(
+            self.hass,
+            user_input[CONF_HOST],
+            user_input[CONF_TOKEN],
+            user_input[CONF_VERIFY_SSL],
+        )
+
+        await client.login(register_event_listener=False)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -70,7 +117,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input:
             try:
+                if user_input.get(CONF_API_TYPE) == APIType.LOCAL and (
+                    user_input[CONF_HUB] not in SERVERS_WITH_LOCAL_API
+                ):
+                    raise LocalApiNotSupported
+
                 await self.async_validate_input(user_input)
+            except LocalApiNotSupported:
+                errors["base"] = "local_api_not_supported"
             except TooManyRequestsException:
                 errors["base"] = "too_many_requests"
             except BadCredentialsException:
@@ -86,26 +140,24 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 if self._config_entry:
                     if self._config_entry.unique_id != self.unique_id:
                         return self.async_abort(reason="reauth_wrong_account")
+                else:
+                    self._abort_if_unique_id_configured()
 
-                    # Update existing entry during reauth
-                    self.hass.config_entries.async_update_entry(
-                        self._config_entry,
-                        data={
-                            **self._config_entry.data,
-                            **user_input,
-                        },
-                    )
-
-                    self.hass.async_create_task(
-                        self.hass.config_entries.async_reload(
-                            self._config_entry.entry_id
-                        )
-                    )
+                if user_input.get(CONF_API_TYPE) == APIType.LOCAL:
+                    self._user_input = user_input
+                    return await self.async_step_local()
 
-                    return self.async_abort(reason="reauth_successful")
+                # Entries without api type use the cloud API
+                user_input.pop(CONF_API_TYPE, None)
 
-                # Create new entry
-                self._abort_if_unique_id_configured()
+                if self._config_entry:
+                    # Drop the local API settings when switching to the cloud API
+                    data = {
+                        key: value
+                        for key, value in self._config_entry.data.items()
+                        if key not in (CONF_API_TYPE, CONF_HOST, CONF_TOKEN)
+                    }
+                    return self._async_update_reauth_entry({**data, **user_input})
 
                 return self.async_create_entry(
                     title=user_input[CONF_USERNAME], data=user_input
@@ -120,11 +172,70 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     vol.Required(CONF_HUB, default=self._default_hub): vol.In(
                         {key: hub.name for key, hub in SUPPORTED_SERVERS.items()}
                     ),
+                    vol.Optional(CONF_API_TYPE, default=self._default_api_type): vol.In(
+                        {APIType.CLOUD: "Cloud", APIType.LOCAL: "Local API"}
+                    ),
                 }
             ),
             errors=errors,
         )
 
+    async def async_step_local(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle the local API (developer mode) step."""
+        errors = {}
+        # During reauth, the host of the entry is suggested
+        default_host = (
+            self._config_entry and self._config_entry.data.get(CONF_HOST)
+        ) or f"gateway-{self.unique_id}.local:8443"
+
+        if user_input:
+            try:
+                user_input[CONF_TOKEN] = await self.async_create_local_token()
+                await self.async_validate_local_input(user_input)
+            except TooManyRequestsException:
+                errors["base"] = "too_many_requests"
+            except BadCredentialsException:
+                errors["base"] = "invalid_auth"
+            except (TimeoutError, ClientError):
+                errors["base"] = "cannot_connect"
+            except Exception as exception:  # pylint: disable=broad-except
+                errors["base"] = "unknown"
+                _LOGGER.exception(exception)
+            else:
+                if self._config_entry:
+                    return self._async_update_reauth_entry(
+                        {**self._config_entry.data, **self._user_input, **user_input}
+                    )
+
+                return self.async_create_entry(
+                    title=self._user_input[CONF_USERNAME],
+                    data={**self._user_input, **user_input},
+                )
+
+        return self.async_show_form(
+            step_id="local",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOST, default=default_host): str,
+                    vol.Required(CONF_VERIFY_SSL, default=True): bool,
+                }
+            ),
+            errors=errors,
+        )
+
+    def _async_update_reauth_entry(self, data: dict[str, Any]) -> FlowResult:
+        """Update the existing entry during reauth, and reload it."""
+        assert self._config_entry
+
+        self.hass.config_entries.async_update_entry(self._config_entry, data=data)
+        self.hass.async_create_task(
+            self.hass.config_entries.async_reload(self._config_entry.entry_id)
+        )
+
+        return self.async_abort(reason="reauth_successful")
+
     async def async_step_dhcp(self, discovery_info: dhcp.DhcpServiceInfo) -> FlowResult:
         """Handle DHCP discovery."""
         hostname = discovery_info.hostname
@@ -166,5 +277,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         self._default_user = self._config_entry.data[CONF_USERNAME]
         self._default_hub = self._config_entry.data[CONF_HUB]
+        self._default_api_type = self._config_entry.data.get(
+            CONF_API_TYPE, APIType.CLOUD
+        )
 
         return await self.async_step_user(user_input)
+
+
+class LocalApiNotSupported(Exception):
+    """The local API is not supported by the selected hub."""
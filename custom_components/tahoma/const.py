@@ -10,12 +10,62 @@ from homeassistant.const import Platform
 DOMAIN: Final = "tahoma"
 LOGGER: logging.Logger = logging.getLogger(__package__)
 
+CONF_API_TYPE = "api_type"
 CONF_HUB = "hub"
 DEFAULT_HUB = "somfy_europe"
 
 UPDATE_INTERVAL = timedelta(seconds=30)
+UPDATE_INTERVAL_LOCAL = timedelta(seconds=5)
 UPDATE_INTERVAL_ALL_ASSUMED_STATE = timedelta(minutes=60)
 
+# Polling is fastest right after a command and slows down when no new events arrive
+MIN_UPDATE_INTERVAL = timedelta(seconds=1)
+MAX_UPDATE_INTERVAL = UPDATE_INTERVAL
+UPDATE_INTERVAL_DECAY = 0.5  # Fraction of the time since the last activity
+
+# Non-empty event batches are followed by up to this number of immediate fetches
+MAX_DRAIN_ROUNDS = 5
+# Events can be fetched once per second per session
+EVENTS_FETCH_INTERVAL = timedelta(seconds=1)
+
+# Executions can get stuck when their final event has been missed
+EXECUTION_MAX_AGE = timedelta(minutes=30)
+EXECUTION_RECONCILIATION_INTERVAL = timedelta(minutes=1)
+
+# Refreshes requested within this window after an (immediate) refresh share one fetch
+REQUEST_REFRESH_COOLDOWN = timedelta(seconds=1)
+
+# The local API falls back to the cloud after consecutive failed or slow event fetches
+LOCAL_MAX_LATENCY = timedelta(seconds=2)
+LOCAL_MAX_FAILURES = 3
+LOCAL_RETRY_INTERVAL = timedelta(minutes=10)
+
+# Commands issued within this window are executed as a single action group
+COMMAND_BATCH_WINDOW = timedelta(milliseconds=100)
+
+# Requests per second and burst size of all calls to the Overkiz API
+API_RATE_LIMIT = 2.0
+API_RATE_LIMIT_BURST = 10
+# Requests are paused after a rate limited response, doubling up to the maximum
+RATE_LIMIT_MIN_BACKOFF = timedelta(seconds=5)
+RATE_LIMIT_MAX_BACKOFF = timedelta(minutes=5)
+
+# Reload requests within this window are coalesced into a single reload
+RELOAD_COOLDOWN = timedelta(seconds=10)
+
+# Connections to the API are shared by all config entries, and kept alive
+# longer than the update interval to avoid a TLS handshake on every update
+DATA_CONNECTORS = f"{DOMAIN}_connectors"
+CONNECTION_KEEPALIVE = timedelta(minutes=2)
+
+# Last known setup and scenarios, used to set up entities before logging in
+STORAGE_KEY = "tahoma.{}"  # Formatted with the config entry id
+STORAGE_VERSION = 1
+SESSION_STORAGE_KEY = "tahoma.{}.session"  # Formatted with the config entry id
+
+# Dispatched with a list of created or updated devices, formatted with the config entry id
+SIGNAL_DEVICES_ADDED = "tahoma_devices_added_{}"
+
 SUPPORTED_PLATFORMS = [
     Platform.ALARM_CONTROL_PANEL,
     Platform.BINARY_SENSOR,
@@ -32,6 +82,15 @@ SUPPORTED_PLATFORMS = [
     Platform.WATER_HEATER,
 ]
 
+# Platforms of which the entities are based on the device definitions
+DEFINITION_PLATFORMS = [
+    Platform.BINARY_SENSOR,
+    Platform.BUTTON,
+    Platform.NUMBER,
+    Platform.SELECT,
+    Platform.SENSOR,
+]
+
 IGNORED_OVERKIZ_DEVICES = [
     UIClass.PROTOCOL_GATEWAY,
     UIClass.POD,
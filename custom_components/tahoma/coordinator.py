@@ -1,31 +1,218 @@
 """Helpers to help coordinate updates."""
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timedelta
 import logging
+import time
+from typing import Any
 
-from aiohttp import ServerDisconnectedError
+from aiohttp import ClientConnectorError, ServerDisconnectedError
+import humps
 from pyoverkiz.client import OverkizClient
-from pyoverkiz.enums import EventName, ExecutionState
+from pyoverkiz.enums import APIType, EventName, ExecutionState
 from pyoverkiz.exceptions import (
     BadCredentialsException,
+    InvalidCommandException,
     MaintenanceException,
     NotAuthenticatedException,
+    OverkizException,
     TooManyRequestsException,
+    UnknownObjectException,
 )
-from pyoverkiz.models import Device, Event, Place
+from pyoverkiz.models import Command, Device, Event, Place, States
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util.decorator import Registry
 
-from .const import DOMAIN, LOGGER, UPDATE_INTERVAL
+from . import api
+from .const import (
+    API_RATE_LIMIT,
+    API_RATE_LIMIT_BURST,
+    COMMAND_BATCH_WINDOW,
+    DOMAIN,
+    EVENTS_FETCH_INTERVAL,
+    EXECUTION_MAX_AGE,
+    EXECUTION_RECONCILIATION_INTERVAL,
+    IGNORED_OVERKIZ_DEVICES,
+    LOCAL_MAX_FAILURES,
+    LOCAL_MAX_LATENCY,
+    LOCAL_RETRY_INTERVAL,
+    LOGGER,
+    MAX_DRAIN_ROUNDS,
+    MAX_UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    RATE_LIMIT_MAX_BACKOFF,
+    RATE_LIMIT_MIN_BACKOFF,
+    RELOAD_COOLDOWN,
+    REQUEST_REFRESH_COOLDOWN,
+    SIGNAL_DEVICES_ADDED,
+    UPDATE_INTERVAL_DECAY,
+)
+from .rate_limiter import OverkizRateLimiter, Priority
 
 EVENT_HANDLERS = Registry()
 
 
+def parse_devices(devices: list[dict[str, Any]]) -> list[Device]:
+    """Parse devices as returned by the API, to be run in the executor."""
+    return [Device(**device) for device in humps.decamelize(devices)]
+
+
+class OverkizExecutions:
+    """Executions started by Home Assistant, indexed by device url and command name.
+
+    Executions are kept in insertion order, so the most recent execution of a
+    device command can be found (e.g. to cancel it).
+    """
+
+    def __init__(self) -> None:
+        """Initialize the execution store."""
+        # Actions (device_url, command_name) of each execution
+        self._actions: dict[str, list[tuple[str, str]]] = {}
+        self._order: dict[str, int] = {}
+        self._counter = 0
+        # Execution ids per (device_url, command_name), used as ordered set
+        self._index: dict[tuple[str, str], dict[str, None]] = {}
+
+    def __contains__(self, exec_id: object) -> bool:
+        """Return True if the execution is running."""
+        return exec_id in self._actions
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the execution ids, oldest first."""
+        return iter(self._actions)
+
+    def __len__(self) -> int:
+        """Return the number of running executions."""
+        return len(self._actions)
+
+    def add(self, exec_id: str, actions: Iterable[tuple[str, str]] = ()) -> None:
+        """Add an execution with its (device_url, command_name) actions."""
+        self.pop(exec_id)
+
+        self._actions[exec_id] = list(actions)
+        self._order[exec_id] = self._counter
+        self._counter += 1
+
+        for action in self._actions[exec_id]:
+            self._index.setdefault(action, {})[exec_id] = None
+
+    def pop(self, exec_id: str) -> list[tuple[str, str]]:
+        """Remove an execution and return its actions."""
+        actions = self._actions.pop(exec_id, [])
+        self._order.pop(exec_id, None)
+
+        for action in actions:
+            if exec_ids := self._index.get(action):
+                exec_ids.pop(exec_id, None)
+
+                if not exec_ids:
+                    del self._index[action]
+
+        return actions
+
+    def clear(self) -> None:
+        """Remove all executions."""
+        self._actions.clear()
+        self._order.clear()
+        self._index.clear()
+
+    def device_urls(self, exec_id: str) -> set[str]:
+        """Return the device urls of an execution."""
+        return {device_url for device_url, _ in self._actions.get(exec_id, [])}
+
+    def is_running(self, device_url: str, command_names: Iterable[str]) -> bool:
+        """Return True if one of the commands is running on the device."""
+        return any((device_url, name) in self._index for name in command_names)
+
+    def latest(self, device_url: str, command_names: Iterable[str]) -> str | None:
+        """Return the most recent execution of one of the commands on the device."""
+        exec_ids = [
+            next(reversed(exec_ids))
+            for name in command_names
+            if (exec_ids := self._index.get((device_url, name)))
+        ]
+
+        return max(exec_ids, key=self._order.__getitem__, default=None)
+
+
+class OverkizDefinitionIndex:
+    """Device urls per state name, command name and widget of the devices.
+
+    Platforms look up the devices of their supported states and commands,
+    instead of scanning every device definition. States and commands of
+    devices ignored by Home Assistant (e.g. gateways) are not indexed.
+    """
+
+    def __init__(self, devices: Iterable[Device] = ()) -> None:
+        """Initialize the index with the given devices."""
+        self._devices: dict[str, Device] = {}
+        # Device urls per key, used as ordered set
+        self._states: dict[str, dict[str, None]] = {}
+        self._commands: dict[str, dict[str, None]] = {}
+        self._widgets: dict[str, dict[str, None]] = {}
+        self.add(devices)
+
+    def add(self, devices: Iterable[Device]) -> None:
+        """Add (or replace) devices in the index."""
+        for device in devices:
+            self.remove([device.device_url])
+            self._devices[device.device_url] = device
+
+            for index, key in self._keys(device):
+                index.setdefault(key, {})[device.device_url] = None
+
+    def remove(self, device_urls: Iterable[str]) -> None:
+        """Remove devices from the index."""
+        for device_url in device_urls:
+            if (device := self._devices.pop(device_url, None)) is None:
+                continue
+
+            for index, key in self._keys(device):
+                if device_urls_of_key := index.get(key):
+                    device_urls_of_key.pop(device_url, None)
+
+                    if not device_urls_of_key:
+                        del index[key]
+
+    def with_state(self, name: str) -> Iterable[str]:
+        """Return the device urls with the state in their definition."""
+        return self._states.get(name, {}).keys()
+
+    def with_command(self, name: str) -> Iterable[str]:
+        """Return the device urls with the command in their definition."""
+        return self._commands.get(name, {}).keys()
+
+    def with_widget(self, widget: str) -> Iterable[str]:
+        """Return the device urls of the widget."""
+        return self._widgets.get(widget, {}).keys()
+
+    def _keys(self, device: Device) -> Iterator[tuple[dict[str, dict[str, None]], str]]:
+        """Return the indexes and keys of a device."""
+        yield self._widgets, device.widget
+
+        if (
+            device.widget in IGNORED_OVERKIZ_DEVICES
+            or device.ui_class in IGNORED_OVERKIZ_DEVICES
+        ):
+            return
+
+        for state in device.definition.states:
+            yield self._states, state.qualified_name
+
+        for command in device.definition.commands:
+            yield self._commands, command.command_name
+
+
 class OverkizDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Device]]):
     """Class to manage fetching data from Overkiz platform."""
 
@@ -36,9 +223,16 @@ class OverkizDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Device]]):
         *,
         name: str,
         client: OverkizClient,
+        fallback_client: OverkizClient | None = None,
         devices: list[Device],
-        places: Place,
+        places: Place | None,
         update_interval: timedelta | None = None,
+        min_update_interval: timedelta = MIN_UPDATE_INTERVAL,
+        max_update_interval: timedelta = MAX_UPDATE_INTERVAL,
+        execution_max_age: timedelta = EXECUTION_MAX_AGE,
+        events_fetch_interval: timedelta = EVENTS_FETCH_INTERVAL,
+        rate_limit: float = API_RATE_LIMIT,
+        rate_limit_burst: int = API_RATE_LIMIT_BURST,
         config_entry_id: str,
     ) -> None:
         """Initialize global data updater."""
@@ -47,39 +241,99 @@ class OverkizDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Device]]):
             logger,
             name=name,
             update_interval=update_interval,
+            request_refresh_debouncer=Debouncer(
+                hass,
+                logger,
+                cooldown=REQUEST_REFRESH_COOLDOWN.total_seconds(),
+                immediate=True,
+            ),
         )
 
         self.data = {}
         self.client = client
+        # Used when the (local) client is unreachable or slow
+        self.primary_client = client
+        self.fallback_client = fallback_client
+        self._failed_fetches = 0
+        self._fallback_since = 0.0
+        self.events_fetch_interval = events_fetch_interval
+        self._last_events_fetch = 0.0
+        self.rate_limiter = OverkizRateLimiter(
+            rate_limit,
+            rate_limit_burst,
+            min_backoff=RATE_LIMIT_MIN_BACKOFF.total_seconds(),
+            max_backoff=RATE_LIMIT_MAX_BACKOFF.total_seconds(),
+        )
         self.devices: dict[str, Device] = {d.device_url: d for d in devices}
+        self.definition_index = OverkizDefinitionIndex(devices)
         self.is_stateless = all(
             device.device_url.startswith("rts://")
             or device.device_url.startswith("internal://")
             for device in devices
         )
-        self.executions: dict[str, dict[str, str]] = {}
+        self.executions = OverkizExecutions()
+        self.execution_max_age = execution_max_age
+        self._execution_timestamps: dict[str, float] = {}
+        self._last_reconciliation = time.monotonic()
         self.areas = self._places_to_area(places)
         self.config_entry_id = config_entry_id
 
+        self.min_update_interval = min_update_interval
+        self.max_update_interval = max_update_interval
+        self._primary_max_update_interval = max_update_interval
+        self._last_activity = time.monotonic()
+
+        # Commands waiting to be executed in the next action group, per device url
+        self._pending_commands: dict[str, list[Command]] = {}
+        # Execution ids of the pending commands, per device url
+        self._pending_execution: asyncio.Future[dict[str, str]] | None = None
+        self._cancel_pending_execution: Callable[[], None] | None = None
+
+        self.suppressed_reloads = 0
+        self._reload_requested = False
+        self._reload_debouncer = Debouncer(
+            hass,
+            logger,
+            cooldown=RELOAD_COOLDOWN.total_seconds(),
+            immediate=False,
+            function=self._async_reload,
+        )
+
+        # Device urls of DEVICE_CREATED / DEVICE_UPDATED events in the current batch
+        self.created_updated_device_urls: set[str] = set()
+
+        # Device urls touched since listeners were last notified
+        self.changed_device_urls: set[str] = set()
+        # Updates without changes, for which no listener has been notified
+        self.skipped_listener_updates = 0
+        # Time spent on parsing the setup and devices, in seconds
+        self.parse_durations: dict[str, float] = {}
+        self._update_all_listeners = True
+        self._listeners_last_update_success = True
+
     async def _async_update_data(self) -> dict[str, Device]:
         """Fetch Overkiz data via event listener."""
         try:
-            events = await self.client.fetch_events()
+            events = await self._async_fetch_events()
         except BadCredentialsException as exception:
             raise ConfigEntryAuthFailed("Invalid authentication.") from exception
         except TooManyRequestsException as exception:
             raise UpdateFailed("Too many requests, try again later.") from exception
         except MaintenanceException as exception:
             raise UpdateFailed("Server is down for maintenance.") from exception
-        except TimeoutError as exception:
+        except (asyncio.TimeoutError, ClientConnectorError) as exception:
             raise UpdateFailed("Failed to connect.") from exception
         except (ServerDisconnectedError, NotAuthenticatedException):
-            self.executions = {}
+            # Entities of the devices with executions are notified they stopped
+            for exec_id in list(self.executions):
+                self._evict_execution(exec_id)
 
             # During the relogin, similar exceptions can be thrown.
             try:
-                await self.client.login()
-                self.devices = await self._get_devices()
+                await self.rate_limiter.async_call_once(
+                    Priority.POLLING, self.client.login
+                )
+                await self._async_resync_devices()
             except BadCredentialsException as exception:
                 raise ConfigEntryAuthFailed("Invalid authentication.") from exception
             except TooManyRequestsException as exception:
@@ -87,6 +341,41 @@ class OverkizDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Device]]):
 
             return self.devices
 
+        await self._async_process_events(events)
+
+        # Drain pending events (e.g. during a gateway resync) in this update cycle
+        drain_rounds = 0
+
+        while events and drain_rounds < MAX_DRAIN_ROUNDS:
+            drain_rounds += 1
+
+            try:
+                events = await self._async_drain_events()
+            except TooManyRequestsException:
+                LOGGER.debug("Rate limited while draining events")
+                break
+            except Exception as exception:  # pylint: disable=broad-except
+                LOGGER.warning("Failed to drain events: %s", exception)
+                break
+
+            await self._async_process_events(events)
+
+        if self.created_updated_device_urls:
+            await self._async_update_devices()
+
+        if self.executions:
+            await self._async_evict_stale_executions()
+
+        if not self.is_stateless:
+            self.update_interval = self._calculate_update_interval()
+
+        return self.devices
+
+    async def _async_process_events(self, events: list[Event]) -> None:
+        """Process a batch of events."""
+        if events:
+            self.async_register_activity()
+
         for event in events:
             LOGGER.debug(event)
 
@@ -104,21 +393,620 @@ class OverkizDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Device]]):
                         },
                     )
 
+    async def _async_drain_events(self) -> list[Event]:
+        """Fetch the events pending after a non-empty batch.
+
+        Fetches are spaced by the events fetch interval. A rate limited drain is
+        not reported to the rate limiter, as its pause would also hold back commands.
+        """
+        delay = self.events_fetch_interval.total_seconds() - (
+            time.monotonic() - self._last_events_fetch
+        )
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        await self.rate_limiter.async_acquire(Priority.POLLING)
+        self._last_events_fetch = time.monotonic()
+
+        return await self.client.fetch_events()
+
+    async def _async_fetch_events(self) -> list[Event]:
+        """Fetch events, falling back when the primary client is unreachable or slow."""
+        self._last_events_fetch = time.monotonic()
+
+        if (
+            self.client is self.fallback_client
+            and time.monotonic() - self._fallback_since
+            > LOCAL_RETRY_INTERVAL.total_seconds()
+        ):
+            await self._async_switch_client(self.primary_client)
+
+        if self.client is not self.primary_client or not self.fallback_client:
+            return await self.rate_limiter.async_call(
+                Priority.POLLING, self.client.fetch_events
+            )
+
+        # Only the request is timed, not its wait for the rate limiter
+        # (e.g. behind commands, or during a pause after a rate limited request)
+        await self.rate_limiter.async_acquire(Priority.POLLING)
+        started = time.monotonic()
+
+        try:
+            events = await self.rate_limiter.async_call_acquired(
+                self.client.fetch_events
+            )
+        except (asyncio.TimeoutError, ClientConnectorError) as exception:
+            self._failed_fetches += 1
+            LOGGER.debug("Failed to fetch events: %s", exception)
+
+            if self._failed_fetches < LOCAL_MAX_FAILURES or not (
+                await self._async_switch_client(self.fallback_client)
+            ):
+                raise
+
+            return await self.rate_limiter.async_call(
+                Priority.POLLING, self.client.fetch_events
+            )
+
+        if time.monotonic() - started > LOCAL_MAX_LATENCY.total_seconds():
+            self._failed_fetches += 1
+
+            if self._failed_fetches >= LOCAL_MAX_FAILURES:
+                await self._async_switch_client(self.fallback_client)
+        else:
+            self._failed_fetches = 0
+
+        return events
+
+    async def _async_switch_client(self, client: OverkizClient) -> bool:
+        """Log in with and switch to another client (e.g. from local to cloud API)."""
+        try:
+            await self.rate_limiter.async_call_once(Priority.POLLING, client.login)
+        except Exception as exception:  # pylint: disable=broad-except
+            LOGGER.debug(
+                "Failed to switch to the %s API: %s", client.api_type.value, exception
+            )
+
+            if client is self.primary_client:
+                # Retry later
+                self._fallback_since = time.monotonic()
+
+            return False
+
+        LOGGER.warning("Switched to the %s API", client.api_type.value)
+
+        self.client = client
+        self._failed_fetches = 0
+        self._fallback_since = time.monotonic()
+
+        if client.api_type == APIType.LOCAL:
+            self.max_update_interval = self._primary_max_update_interval
+        else:
+            self.max_update_interval = MAX_UPDATE_INTERVAL
+
+        return True
+
+    async def _async_update_devices(self) -> None:
+        """Add or update created / updated devices without reloading the integration.
+
+        Entities of updated devices are removed and recreated, since their
+        name, definition or platform can have changed. Only the affected
+        devices, with the known sub devices sharing their base url, are fetched.
+        """
+        device_urls = set(self.created_updated_device_urls)
+        self.created_updated_device_urls.clear()
+        base_device_urls = {device_url.split("#")[0] for device_url in device_urls}
+        device_urls.update(
+            device_url
+            for device_url in self.devices
+            if device_url.split("#")[0] in base_device_urls
+        )
+
+        try:
+            devices = await self._get_devices(device_urls)
+        except Exception as exception:  # pylint: disable=broad-except
+            LOGGER.debug("Failed to update devices, reloading: %s", exception)
+            await self.async_request_reload()
+            return
+
+        await self._async_add_devices(devices)
+
+    async def async_reconcile_devices(
+        self, devices: list[Device], places: Place | None
+    ) -> None:
+        """Reconcile the devices (e.g. from a stored setup) with the live devices.
+
+        Removed devices are removed from Home Assistant, while created devices and
+        devices of which the definition changed are (re)added. Other devices only
+        get their states updated.
+        """
+        live_devices = {device.device_url: device for device in devices}
+        self._remove_devices(self.devices.keys() - live_devices.keys())
+
+        added_devices = []
+
+        for device_url, device in live_devices.items():
+            current_device = self.devices.get(device_url)
+
+            if current_device is None or (
+                current_device.label,
+                current_device.widget,
+                current_device.ui_class,
+                current_device.definition,
+            ) != (device.label, device.widget, device.ui_class, device.definition):
+                added_devices.append(device)
+            else:
+                self.devices[device_url] = device
+
+        if added_devices:
+            await self._async_add_devices(added_devices)
+
+        self.areas = self._places_to_area(places)
+        self._update_all_listeners = True
+        self.async_set_updated_data(self.devices)
+
+    async def _async_resync_devices(self) -> None:
+        """Resync the devices after a relogin, keeping the existing Device objects.
+
+        Events can be missed while disconnected, thus the states of known devices
+        are merged into their Device objects. Only devices added in the meantime
+        are parsed, and removed devices are removed from Home Assistant.
+        """
+        LOGGER.debug("Resyncing device states via /setup/devices")
+        raw_devices = await self.rate_limiter.async_call_once(
+            Priority.POLLING, api.get_raw_devices, self.client
+        )
+        raw_devices_by_url = {device["deviceURL"]: device for device in raw_devices}
+
+        self._remove_devices(self.devices.keys() - raw_devices_by_url.keys())
+
+        for device_url, device in self.devices.items():
+            raw_device = raw_devices_by_url[device_url]
+
+            if (device.available, device.enabled) != (
+                raw_device["available"],
+                raw_device["enabled"],
+            ):
+                device.available = raw_device["available"]
+                device.enabled = raw_device["enabled"]
+                self.changed_device_urls.add(device_url)
+
+            for state in States(humps.decamelize(raw_device.get("states"))):
+                current_state = device.states[state.name]
+
+                if current_state is None or current_state.value != state.value:
+                    device.states[state.name] = state
+                    self.changed_device_urls.add(device_url)
+
+        if created_device_urls := raw_devices_by_url.keys() - self.devices.keys():
+            LOGGER.debug(
+                "%s devices created while disconnected", len(created_device_urls)
+            )
+            await self._async_add_devices(
+                await self.hass.async_add_executor_job(
+                    parse_devices,
+                    [raw_devices_by_url[url] for url in created_device_urls],
+                )
+            )
+
+    def _remove_devices(self, device_urls: set[str]) -> None:
+        """Remove devices from the coordinator and the device registry."""
+        registry = dr.async_get(self.hass)
+
+        self.definition_index.remove(device_urls)
+
+        for device_url in device_urls:
+            LOGGER.debug("Device removed (%s)", device_url)
+            del self.devices[device_url]
+
+            if registered_device := registry.async_get_device(
+                {(DOMAIN, device_url.split("#")[0])}
+            ):
+                registry.async_remove_device(registered_device.id)
+
+    async def _async_add_devices(self, added_devices: list[Device]) -> None:
+        """Add created devices and recreate the entities of updated devices."""
+        await self._async_remove_device_entities(
+            {d.device_url for d in added_devices if d.device_url in self.devices}
+        )
+
+        for device in added_devices:
+            LOGGER.debug("Device created or updated (%s)", device)
+            self.devices[device.device_url] = device
+            self.changed_device_urls.add(device.device_url)
+
+        self.definition_index.add(added_devices)
+
+        async_dispatcher_send(
+            self.hass, SIGNAL_DEVICES_ADDED.format(self.config_entry_id), added_devices
+        )
+
+    async def async_execute_command(
+        self, device_url: str, command: Command
+    ) -> str | None:
+        """Execute a command together with the commands issued in the batch window.
+
+        Return the execution id of the action group, or None if it failed.
+        Queued commands with arguments (e.g. setClosure while dragging a slider)
+        are replaced by a newer command with the same name for the same device.
+        """
+        device_commands = self._pending_commands.setdefault(device_url, [])
+
+        if command.parameters:
+            device_commands[:] = [c for c in device_commands if c.name != command.name]
+
+        device_commands.append(command)
+
+        if self._pending_execution is None:
+            self._pending_execution = self.hass.loop.create_future()
+            self._cancel_pending_execution = async_call_later(
+                self.hass, COMMAND_BATCH_WINDOW, self._async_execute_pending_commands
+            )
+
+        exec_ids = await asyncio.shield(self._pending_execution)
+
+        return exec_ids.get(device_url)
+
+    async def _async_execute_pending_commands(self, _: datetime | None = None) -> None:
+        """Execute all pending commands as a single action group."""
+        pending_execution, self._pending_execution = self._pending_execution, None
+        commands, self._pending_commands = self._pending_commands, {}
+        self._cancel_pending_execution = None
+
+        if pending_execution is None:
+            return
+
+        try:
+            executions = await self._async_execute_commands(commands)
+
+            # Commands return before the refresh
+            pending_execution.set_result(
+                {
+                    device_url: exec_id
+                    for exec_id, exec_commands in executions.items()
+                    for device_url in exec_commands
+                }
+            )
+        finally:
+            # Waiting callers are released, also when cancelled (e.g. on unload)
+            if not pending_execution.done():
+                pending_execution.set_result({})
+
+        if executions:
+            self.async_register_activity()
+            self.async_update_listeners()
+
+            # The first refresh is immediate, while commands in quick
+            # succession after it share a single event fetch
+            await self.async_request_refresh()
+
+    async def _async_execute_commands(
+        self, commands: dict[str, list[Command]]
+    ) -> dict[str, dict[str, list[Command]]]:
+        """Execute commands, and return the commands per execution id."""
+        await self._async_cancel_superseded_executions(commands)
+
+        try:
+            executions = await self._async_apply_commands(commands)
+        except Exception as exception:  # pylint: disable=broad-except
+            LOGGER.error(exception)
+            return {}
+
+        # ExecutionRegisteredEvent doesn't contain the device_url, thus we need to register it here
+        for exec_id, exec_commands in executions.items():
+            self.executions.add(
+                exec_id,
+                (
+                    (device_url, command.name)
+                    for device_url, device_commands in exec_commands.items()
+                    for command in device_commands
+                ),
+            )
+            self.changed_device_urls.update(exec_commands)
+
+        return executions
+
+    async def _async_cancel_superseded_executions(
+        self, commands: dict[str, list[Command]]
+    ) -> None:
+        """Cancel running executions of which the arguments are superseded.
+
+        Only executions limited to a single device are cancelled, since
+        cancelling an action group would stop the other devices as well.
+        """
+        exec_ids = {
+            exec_id
+            for device_url, device_commands in commands.items()
+            for command in device_commands
+            if command.parameters
+            and (exec_id := self.executions.latest(device_url, [command.name]))
+            and self.executions.device_urls(exec_id) == {device_url}
+        }
+
+        for exec_id in exec_ids:
+            LOGGER.debug("Cancelling superseded execution %s", exec_id)
+
+            try:
+                await self.rate_limiter.async_call(
+                    Priority.COMMAND, self.client.cancel_command, exec_id
+                )
+            except Exception as exception:  # pylint: disable=broad-except
+                LOGGER.debug("Failed to cancel execution %s: %s", exec_id, exception)
+                continue
+
+            self._evict_execution(exec_id)
+
+    async def _async_apply_commands(
+        self, commands: dict[str, list[Command]]
+    ) -> dict[str, dict[str, list[Command]]]:
+        """Apply commands on one or more devices in as few executions as possible.
+
+        Return the commands per execution id. When an action group of multiple
+        devices is rejected (e.g. a command unknown to one of the devices), the
+        commands of each device are executed separately.
+        """
+        if len(commands) > 1:
+            try:
+                return {await self._async_apply_action_group(commands): commands}
+            except (
+                InvalidCommandException,
+                OverkizException,
+                UnknownObjectException,
+            ) as exception:
+                LOGGER.debug(
+                    "Failed to execute commands on %s devices at once, "
+                    "executing them per device: %s",
+                    len(commands),
+                    exception,
+                )
+
+        executions: dict[str, dict[str, list[Command]]] = {}
+
+        for device_url, device_commands in commands.items():
+            try:
+                exec_id = await self.rate_limiter.async_call(
+                    Priority.COMMAND,
+                    self.client.execute_commands,
+                    device_url,
+                    device_commands,
+                    "Home Assistant",
+                )
+            except Exception as exception:  # pylint: disable=broad-except
+                LOGGER.error(exception)
+                continue
+
+            executions[exec_id] = {device_url: device_commands}
+
+        return executions
+
+    async def _async_apply_action_group(
+        self, commands: dict[str, list[Command]]
+    ) -> str:
+        """Apply the commands of multiple devices in a single action group."""
+        LOGGER.debug("Executing commands on %s devices at once", len(commands))
+
+        return await self.rate_limiter.async_call(
+            Priority.COMMAND,
+            api.execute_action_group,
+            self.client,
+            commands,
+            "Home Assistant",
+        )
+
+    async def async_request_reload(self) -> None:
+        """Request a reload of the config entry.
+
+        All requests within the cooldown are coalesced into a single reload.
+        """
+        if self._reload_requested:
+            self.suppressed_reloads += 1
+            LOGGER.debug(
+                "Reload already requested, %s reload(s) suppressed",
+                self.suppressed_reloads,
+            )
+            return
+
+        self._reload_requested = True
+        await self._reload_debouncer.async_call()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel pending reload and refresh requests, and pending commands."""
+        self._reload_requested = False
+        self._reload_debouncer.async_cancel()
+        self._debounced_refresh.async_cancel()
+
+        if self._cancel_pending_execution:
+            self._cancel_pending_execution()
+            self._cancel_pending_execution = None
+
+        if self._pending_execution is not None:
+            # Release the callers waiting for the pending commands
+            self._pending_execution.set_result({})
+            self._pending_execution = None
+            self._pending_commands = {}
+
+    async def _async_reload(self) -> None:
+        """Reload the config entry."""
+        self._reload_requested = False
+        await self.hass.config_entries.async_reload(self.config_entry_id)
+
+    async def _async_remove_device_entities(self, device_urls: set[str]) -> None:
+        """Remove the entities of the given devices from Home Assistant."""
+        if not device_urls:
+            return
+
+        for platform in async_get_platforms(self.hass, DOMAIN):
+            if (
+                not platform.config_entry
+                or platform.config_entry.entry_id != self.config_entry_id
+            ):
+                continue
+
+            for entity_id, entity in list(platform.entities.items()):
+                if getattr(entity, "device_url", None) in device_urls:
+                    await platform.async_remove_entity(entity_id)
+
+    async def _async_evict_stale_executions(self) -> None:
+        """Remove executions of which the final event has been missed.
+
+        Executions older than the max age are always removed. Periodically,
+        executions which are not running anymore according to the API are
+        removed as well.
+        """
+        now = time.monotonic()
+
+        for exec_id in self.executions:
+            self._execution_timestamps.setdefault(exec_id, now)
+
+        for exec_id, registered_at in list(self._execution_timestamps.items()):
+            if exec_id not in self.executions:
+                del self._execution_timestamps[exec_id]
+            elif now - registered_at > self.execution_max_age.total_seconds():
+                LOGGER.debug("Execution %s exceeded its max age", exec_id)
+                self._evict_execution(exec_id)
+
+        reconciliation_interval = EXECUTION_RECONCILIATION_INTERVAL.total_seconds()
+
+        if not self.executions or now - self._last_reconciliation < (
+            reconciliation_interval
+        ):
+            return
+
+        self._last_reconciliation = now
+
+        try:
+            current_executions = await self.rate_limiter.async_call_once(
+                Priority.POLLING, self.client.get_current_executions
+            )
+        except Exception as exception:  # pylint: disable=broad-except
+            LOGGER.debug("Failed to retrieve current executions: %s", exception)
+            return
+
+        current_exec_ids = {execution.id for execution in current_executions}
+
+        for exec_id, registered_at in list(self._execution_timestamps.items()):
+            # Recent executions may not be returned by the API yet
+            if (
+                exec_id not in current_exec_ids
+                and now - registered_at > reconciliation_interval
+            ):
+                LOGGER.debug("Execution %s is not running anymore", exec_id)
+                self._evict_execution(exec_id)
+
+    def _evict_execution(self, exec_id: str) -> None:
+        """Remove an execution and notify the entities of the related devices."""
+        self._execution_timestamps.pop(exec_id, None)
+
+        for device_url, _ in self.executions.pop(exec_id):
+            self.changed_device_urls.add(device_url)
+
+    @callback
+    def async_register_activity(self) -> None:
+        """Register activity (command or events), which speeds up polling."""
+        self._last_activity = time.monotonic()
+
+        if not self.is_stateless:
+            self.update_interval = self.min_update_interval
+
+    def _calculate_update_interval(self) -> timedelta:
+        """Calculate the update interval based on the pending executions.
+
+        Without pending executions the coordinator polls at the maximum interval.
+        Otherwise the interval grows with the time since the last activity,
+        and shrinks with the number of pending executions.
+        """
         if not self.executions:
-            self.update_interval = UPDATE_INTERVAL
+            return self.max_update_interval
 
-        return self.devices
+        since_last_activity = time.monotonic() - self._last_activity
+        interval = timedelta(
+            seconds=since_last_activity * UPDATE_INTERVAL_DECAY / len(self.executions)
+        )
+
+        return max(self.min_update_interval, min(interval, self.max_update_interval))
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners of the devices changed since the last update.
+
+        Entities register with their base device url as listener context, so
+        sub devices (#2, #3, ...) will wake up the entities using linked devices.
+        Listeners without context and state changes of the coordinator itself
+        (e.g. failed updates) still result in an update of all listeners.
+        """
+        if (
+            self._update_all_listeners
+            or self.last_update_success != self._listeners_last_update_success
+        ):
+            self._update_all_listeners = False
+            self._listeners_last_update_success = self.last_update_success
+            self.changed_device_urls.clear()
+            super().async_update_listeners()
+            return
+
+        if not self.changed_device_urls:
+            self.skipped_listener_updates += 1
+            return
 
-    async def _get_devices(self) -> dict[str, Device]:
-        """Fetch devices."""
-        LOGGER.debug("Fetching all devices and state via /setup/devices")
-        return {d.device_url: d for d in await self.client.get_devices(refresh=True)}
+        changed_base_device_urls = {
+            device_url.split("#")[0] for device_url in self.changed_device_urls
+        }
+        self.changed_device_urls.clear()
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed_base_device_urls:
+                update_callback()
+
+    async def _get_devices(self, device_urls: set[str]) -> list[Device]:
+        """Fetch the given devices and their states.
+
+        A few devices are fetched one by one via /setup/devices/{url}, within the
+        burst of the rate limiter. More devices (e.g. after a gateway resync) are
+        filtered from a single /setup/devices fetch, to keep the request budget
+        for commands and event polling.
+        """
+        if len(device_urls) > self.rate_limiter.burst:
+            LOGGER.debug("Fetching %s devices via /setup/devices", len(device_urls))
+            raw_devices = [
+                raw_device
+                for raw_device in await self.rate_limiter.async_call_once(
+                    Priority.POLLING, api.get_raw_devices, self.client
+                )
+                if raw_device["deviceURL"] in device_urls
+            ]
+        else:
+            LOGGER.debug(
+                "Fetching %s devices via /setup/devices/{url}", len(device_urls)
+            )
+            raw_devices = await asyncio.gather(
+                *(
+                    self.rate_limiter.async_call_once(
+                        Priority.POLLING, api.get_raw_device, self.client, device_url
+                    )
+                    for device_url in sorted(device_urls)
+                )
+            )
+
+        # Parsing hundreds of devices would block the event loop
+        started = time.monotonic()
+        devices = await self.hass.async_add_executor_job(
+            parse_devices, list(raw_devices)
+        )
+        self.parse_durations["devices"] = time.monotonic() - started
 
-    def _places_to_area(self, place: Place) -> dict[str, str]:
-        """Convert places with sub_places to a flat dictionary [placeoid, label])."""
-        areas = {}
-        if isinstance(place, Place):
-            areas[place.oid] = place.label
+        return devices
+
+    def _places_to_area(self, place: Place | None) -> dict[str, str]:
+        """Convert places with sub_places to a flat dictionary [placeoid, label]).
+
+        The setup of the local API has no places.
+        """
+        if place is None:
+            return {}
+
+        areas = {place.oid: place.label}
 
         if isinstance(place.sub_places, list):
             for sub_place in place.sub_places:
@@ -134,6 +1022,7 @@ async def on_device_available(
     """Handle device available event."""
     if event.device_url:
         coordinator.devices[event.device_url].available = True
+        coordinator.changed_device_urls.add(event.device_url)
 
 
 @EVENT_HANDLERS.register(EventName.DEVICE_UNAVAILABLE)
@@ -144,6 +1033,7 @@ async def on_device_unavailable_disabled(
     """Handle device unavailable / disabled event."""
     if event.device_url:
         coordinator.devices[event.device_url].available = False
+        coordinator.changed_device_urls.add(event.device_url)
 
 
 @EVENT_HANDLERS.register(EventName.DEVICE_CREATED)
@@ -151,10 +1041,13 @@ async def on_device_unavailable_disabled(
 async def on_device_created_updated(
     coordinator: OverkizDataUpdateCoordinator, event: Event
 ) -> None:
-    """Handle device unavailable / disabled event."""
-    coordinator.hass.async_create_task(
-        coordinator.hass.config_entries.async_reload(coordinator.config_entry_id)
-    )
+    """Handle device created / updated event."""
+    if not event.device_url:
+        await coordinator.async_request_reload()
+        return
+
+    # Devices are fetched once per batch, see _async_update_devices
+    coordinator.created_updated_device_urls.add(event.device_url)
 
 
 @EVENT_HANDLERS.register(EventName.DEVICE_STATE_CHANGED)
@@ -165,8 +1058,15 @@ async def on_device_state_changed(
     if not event.device_url:
         return
 
+    device = coordinator.devices[event.device_url]
+
     for state in event.device_states:
-        device = coordinator.devices[event.device_url]
+        current_state = device.states[state.name]
+
+        # Events can repeat the current value, which doesn't need an entity update
+        if current_state is None or current_state.value != state.value:
+            coordinator.changed_device_urls.add(event.device_url)
+
         device.states[state.name] = state
 
 
@@ -186,6 +1086,7 @@ async def on_device_removed(
 
     if event.device_url:
         del coordinator.devices[event.device_url]
+        coordinator.definition_index.remove([event.device_url])
 
 
 @EVENT_HANDLERS.register(EventName.EXECUTION_REGISTERED)
@@ -194,10 +1095,14 @@ async def on_execution_registered(
 ) -> None:
     """Handle execution registered event."""
     if event.exec_id and event.exec_id not in coordinator.executions:
-        coordinator.executions[event.exec_id] = {}
+        coordinator.executions.add(event.exec_id)
+
+    if event.exec_id:
+        coordinator.changed_device_urls.update(
+            coordinator.executions.device_urls(event.exec_id)
+        )
 
-    if not coordinator.is_stateless:
-        coordinator.update_interval = timedelta(seconds=1)
+    coordinator.async_register_activity()
 
 
 @EVENT_HANDLERS.register(EventName.EXECUTION_STATE_CHANGED)
@@ -209,4 +1114,5 @@ async def on_execution_state_changed(
         ExecutionState.COMPLETED,
         ExecutionState.FAILED,
     ]:
-        del coordinator.executions[event.exec_id]
+        for device_url, _ in coordinator.executions.pop(event.exec_id):
+            coordinator.changed_device_urls.add(device_url)
@@ -1,16 +1,18 @@
 """Support for Overkiz covers - shutters etc."""
 from pyoverkiz.enums import OverkizCommand, UIClass
+from pyoverkiz.models import Device
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeAssistantOverkizData
+from . import HomeAssistantOverkizData, async_setup_device_entities
 from .const import DOMAIN
 from .cover_entities.awning import Awning
 from .cover_entities.generic_cover import OverkizGenericCover
 from .cover_entities.vertical_cover import VerticalCover
+from .executor import get_capabilities
 
 
 async def async_setup_entry(
@@ -19,23 +21,26 @@ async def async_setup_entry(
     """Set up the Overkiz covers from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[OverkizGenericCover] = [
-        Awning(device.device_url, data.coordinator)
-        for device in data.platforms[Platform.COVER]
-        if device.ui_class == UIClass.AWNING
-    ]
-
-    entities += [
-        VerticalCover(device.device_url, data.coordinator)
-        for device in data.platforms[Platform.COVER]
-        if device.ui_class != UIClass.AWNING
-    ]
-
-    entities += [
-        VerticalCover(device.device_url, data.coordinator, low_speed=True)
-        for device in data.platforms[Platform.COVER]
-        if device.ui_class != UIClass.AWNING
-        and OverkizCommand.SET_CLOSURE_AND_LINEAR_SPEED in device.definition.commands
-    ]
-
-    async_add_entities(entities)
+    @callback
+    def async_add_covers(devices: list[Device]) -> None:
+        """Add Overkiz covers for the given devices."""
+        entities: list[OverkizGenericCover] = []
+
+        for device in devices:
+            if device.ui_class == UIClass.AWNING:
+                entities.append(Awning(device.device_url, data.coordinator))
+                continue
+
+            entities.append(VerticalCover(device.device_url, data.coordinator))
+
+            if (
+                OverkizCommand.SET_CLOSURE_AND_LINEAR_SPEED
+                in get_capabilities(device).commands
+            ):
+                entities.append(
+                    VerticalCover(device.device_url, data.coordinator, low_speed=True)
+                )
+
+        async_add_entities(entities)
+
+    async_setup_device_entities(hass, entry, Platform.COVER, async_add_covers)
@@ -22,10 +22,9 @@ class Awning(OverkizGenericCover):
 
     _attr_device_class = DEVICE_CLASS_AWNING
 
-    @property
-    def supported_features(self) -> int:
-        """Flag supported features."""
-        supported_features: int = super().supported_features
+    def resolve_supported_features(self) -> int:
+        """Resolve the supported features from the device definition."""
+        supported_features = super().resolve_supported_features()
 
         if self.executor.has_command(OverkizCommand.SET_DEPLOYMENT):
             supported_features |= SUPPORT_SET_POSITION
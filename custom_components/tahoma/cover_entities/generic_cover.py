@@ -40,6 +40,13 @@ COMMANDS_CLOSE: list[OverkizCommand] = [
 ]
 COMMANDS_CLOSE_TILT: list[OverkizCommand] = [OverkizCommand.CLOSE_SLATS]
 
+COMMANDS_OPENING: frozenset[OverkizCommand] = frozenset(
+    COMMANDS_OPEN + COMMANDS_OPEN_TILT
+)
+COMMANDS_CLOSING: frozenset[OverkizCommand] = frozenset(
+    COMMANDS_CLOSE + COMMANDS_CLOSE_TILT
+)
+
 COMMANDS_SET_TILT_POSITION: list[OverkizCommand] = [OverkizCommand.SET_ORIENTATION]
 
 
@@ -120,10 +127,8 @@ class OverkizGenericCover(OverkizEntity, CoverEntity):
             return None
 
         # Check if cover movement execution is currently running
-        if any(
-            execution.get("device_url") == self.device.device_url
-            and execution.get("command_name") in COMMANDS_OPEN + COMMANDS_OPEN_TILT
-            for execution in self.coordinator.executions.values()
+        if self.coordinator.executions.is_running(
+            self.device.device_url, COMMANDS_OPENING
         ):
             return True
 
@@ -145,10 +150,8 @@ class OverkizGenericCover(OverkizEntity, CoverEntity):
             return None
 
         # Check if cover movement execution is currently running
-        if any(
-            execution.get("device_url") == self.device.device_url
-            and execution.get("command_name") in COMMANDS_CLOSE + COMMANDS_CLOSE_TILT
-            for execution in self.coordinator.executions.values()
+        if self.coordinator.executions.is_running(
+            self.device.device_url, COMMANDS_CLOSING
         ):
             return True
 
@@ -175,7 +178,18 @@ class OverkizGenericCover(OverkizEntity, CoverEntity):
 
     @property
     def supported_features(self) -> int:
-        """Flag supported features."""
+        """Flag supported features, resolved once per entity class and device type."""
+        features = self.executor.capabilities.features
+
+        if (supported_features := features.get(type(self))) is None:
+            supported_features = features[
+                type(self)
+            ] = self.resolve_supported_features()
+
+        return supported_features
+
+    def resolve_supported_features(self) -> int:
+        """Resolve the supported features from the device definition."""
         supported_features = 0
 
         if self.executor.has_command(*COMMANDS_OPEN_TILT):
@@ -56,10 +56,9 @@ class VerticalCover(OverkizGenericCover):
             self._attr_name = f"{self._attr_name} Low Speed"
             self._attr_unique_id = f"{self._attr_unique_id}_low_speed"
 
-    @property
-    def supported_features(self) -> int:
-        """Flag supported features."""
-        supported_features: int = super().supported_features
+    def resolve_supported_features(self) -> int:
+        """Resolve the supported features from the device definition."""
+        supported_features = super().resolve_supported_features()
 
         if self.executor.has_command(OverkizCommand.SET_CLOSURE):
             supported_features |= SUPPORT_SET_POSITION
@@ -8,6 +8,7 @@ from homeassistant.core import HomeAssistant
 
 from . import HomeAssistantOverkizData
 from .const import DOMAIN
+from .rate_limiter import Priority
 
 
 async def async_get_config_entry_diagnostics(
@@ -15,7 +16,22 @@ async def async_get_config_entry_diagnostics(
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
-    client = data.coordinator.client
-    setup = await client.get_diagnostic_data()
+    coordinator = data.coordinator
+    setup = await coordinator.rate_limiter.async_call(
+        Priority.DIAGNOSTICS, coordinator.client.get_diagnostic_data
+    )
 
-    return cast(dict, setup)
+    # The setup is kept at the top level, next to the coordinator statistics
+    return {
+        **cast(dict, setup),
+        "coordinator": {
+            "api_type": coordinator.client.api_type.value,
+            "update_interval": str(coordinator.update_interval),
+            "executions": len(coordinator.executions),
+            "skipped_listener_updates": coordinator.skipped_listener_updates,
+            "suppressed_reloads": coordinator.suppressed_reloads,
+            "rate_limited_requests": coordinator.rate_limiter.rate_limited_count,
+            "request_rate": coordinator.rate_limiter.current_rate,
+            "parse_durations": coordinator.parse_durations,
+        },
+    }
@@ -25,9 +25,10 @@ class OverkizEntity(CoordinatorEntity):
         self, device_url: str, coordinator: OverkizDataUpdateCoordinator
     ) -> None:
         """Initialize the device."""
-        super().__init__(coordinator)
         self.device_url = device_url
         self.base_device_url, *_ = self.device_url.split("#")
+        # Listen only to coordinator updates of this (base) device
+        super().__init__(coordinator, context=self.base_device_url)
         self.executor = OverkizExecutor(device_url, coordinator)
 
         self._attr_assumed_state = not self.device.states
@@ -78,7 +79,7 @@ class OverkizEntity(CoordinatorEntity):
                 self.executor.select_attribute(OverkizAttribute.CORE_FIRMWARE_REVISION),
             ),
             hw_version=self.device.controllable_name,
-            suggested_area=self.coordinator.areas[self.device.place_oid],
+            suggested_area=self.coordinator.areas.get(self.device.place_oid),
             via_device=(DOMAIN, self.executor.get_gateway_id()),
             configuration_url=self.coordinator.client.server.configuration_url,
         )
@@ -8,8 +8,39 @@ from pyoverkiz.enums.command import OverkizCommand
 from pyoverkiz.models import Command, Device
 from pyoverkiz.types import StateType as OverkizStateType
 
-from .const import LOGGER
 from .coordinator import OverkizDataUpdateCoordinator
+from .rate_limiter import Priority
+
+
+class OverkizCapabilities:
+    """Commands of a device definition, for O(1) lookups.
+
+    Capabilities are shared by all devices with the same command and state
+    names, together with the feature flags resolved by entities of these devices.
+    """
+
+    def __init__(self, commands: frozenset[str]) -> None:
+        """Initialize the capabilities of a device definition."""
+        self.commands = commands
+        # Supported features per entity class
+        self.features: dict[type, int] = {}
+
+
+# Process-wide, since devices of the same type mostly share their definition
+_CAPABILITIES: dict[tuple[frozenset[str], frozenset[str]], OverkizCapabilities] = {}
+
+
+def get_capabilities(device: Device) -> OverkizCapabilities:
+    """Return the (cached) capabilities of a device."""
+    definition = device.definition
+    commands = frozenset(command.command_name for command in definition.commands)
+    # Devices of the same type can differ per firmware version
+    key = (commands, frozenset(state.qualified_name for state in definition.states))
+
+    if (capabilities := _CAPABILITIES.get(key)) is None:
+        capabilities = _CAPABILITIES[key] = OverkizCapabilities(commands)
+
+    return capabilities
 
 
 class OverkizExecutor:
@@ -22,6 +53,7 @@ class OverkizExecutor:
         self.device_url = device_url
         self.coordinator = coordinator
         self.base_device_url = self.device_url.split("#")[0]
+        self._capabilities: tuple[Device, OverkizCapabilities] | None = None
 
     @property
     def device(self) -> Device:
@@ -32,9 +64,19 @@ class OverkizExecutor:
         """Return Overkiz device sharing the same base url."""
         return self.coordinator.data[f"{self.base_device_url}#{index}"]
 
+    @property
+    def capabilities(self) -> OverkizCapabilities:
+        """Return the capabilities of the device, until it is updated."""
+        device = self.device
+
+        if self._capabilities is None or self._capabilities[0] is not device:
+            self._capabilities = (device, get_capabilities(device))
+
+        return self._capabilities[1]
+
     def select_command(self, *commands: str) -> str | None:
         """Select first existing command in a list of commands."""
-        existing_commands = self.device.definition.commands
+        existing_commands = self.capabilities.commands
         return next((c for c in commands if c in existing_commands), None)
 
     def has_command(self, *commands: str) -> bool:
@@ -62,71 +104,80 @@ class OverkizExecutor:
         return None
 
     async def async_execute_command(self, command_name: str, *args: Any) -> None:
-        """Execute device command in async context."""
-        try:
-            exec_id = await self.coordinator.client.execute_command(
-                self.device.device_url,
-                Command(command_name, list(args)),
-                "Home Assistant",
-            )
-        except Exception as exception:  # pylint: disable=broad-except
-            LOGGER.error(exception)
-            return
-
-        # ExecutionRegisteredEvent doesn't contain the device_url, thus we need to register it here
-        self.coordinator.executions[exec_id] = {
-            "device_url": self.device.device_url,
-            "command_name": command_name,
-        }
-
-        await self.coordinator.async_refresh()
+        """Execute device command in async context.
+
+        Commands of multiple devices issued at once (e.g. via a group or an area)
+        are batched by the coordinator into a single execution. Rapid changes of
+        the same command (e.g. slider drags) only execute the latest arguments.
+        """
+        await self.coordinator.async_execute_command(
+            self.device.device_url, Command(command_name, list(args))
+        )
 
     async def async_cancel_command(
         self, commands_to_cancel: list[OverkizCommand]
     ) -> bool:
-        """Cancel running execution by command."""
+        """Cancel running execution by command.
+
+        Executions shared with other devices (e.g. an action group of several
+        devices) are not cancelled, since that would stop the other devices as
+        well. The device is stopped instead.
+        """
+        device_url = self.device.device_url
 
         # Cancel a running execution
         # Retrieve executions initiated via Home Assistant from Data Update Coordinator queue
-        exec_id = next(
-            (
-                exec_id
-                # Reverse dictionary to cancel the last added execution
-                for exec_id, execution in reversed(self.coordinator.executions.items())
-                if execution.get("device_url") == self.device.device_url
-                and execution.get("command_name") in commands_to_cancel
-            ),
-            None,
-        )
+        exec_id = self.coordinator.executions.latest(device_url, commands_to_cancel)
 
         if exec_id:
+            if self.coordinator.executions.device_urls(exec_id) != {device_url}:
+                return await self._async_stop()
+
             await self.async_cancel_execution(exec_id)
             return True
 
         # Retrieve executions initiated outside Home Assistant via API
-        executions = await self.coordinator.client.get_current_executions()
-        exec_id = next(
+        executions = await self.coordinator.rate_limiter.async_call_once(
+            Priority.COMMAND, self.coordinator.client.get_current_executions
+        )
+        execution = next(
             (
-                execution.id
+                execution
                 for execution in executions
                 # Reverse dictionary to cancel the last added execution
                 for action in reversed(execution.action_group.get("actions"))
                 for command in action.get("commands")
-                if action.get("device_url") == self.device.device_url
+                if action.get("device_url") == device_url
                 and command.get("name") in commands_to_cancel
             ),
             None,
         )
 
-        if exec_id:
-            await self.async_cancel_execution(exec_id)
+        if execution:
+            if {
+                action.get("device_url")
+                for action in execution.action_group.get("actions")
+            } != {device_url}:
+                return await self._async_stop()
+
+            await self.async_cancel_execution(execution.id)
+            return True
+
+        return False
+
+    async def _async_stop(self) -> bool:
+        """Stop the device, instead of cancelling an execution of other devices."""
+        if command := self.select_command(OverkizCommand.STOP):
+            await self.async_execute_command(command)
             return True
 
         return False
 
     async def async_cancel_execution(self, exec_id: str) -> None:
         """Cancel running execution via execution id."""
-        await self.coordinator.client.cancel_command(exec_id)
+        await self.coordinator.rate_limiter.async_call(
+            Priority.COMMAND, self.coordinator.client.cancel_command, exec_id
+        )
 
     def get_gateway_id(self) -> str:
         """
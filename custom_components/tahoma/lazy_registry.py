@@ -0,0 +1,59 @@
+"""Registry of entity classes which are imported on first use."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+import importlib
+from typing import Generic, TypeVar
+
+from homeassistant.core import HomeAssistant
+
+_T = TypeVar("_T")
+
+
+class LazyClassRegistry(Mapping[str, type[_T]], Generic[_T]):
+    """Classes per widget, of which the module is imported on first use.
+
+    Most accounts own only a few device types, thus importing all device
+    implementations of a platform (e.g. climate) slows down the start. Modules
+    are imported in the executor via async_load, before their classes are
+    looked up.
+    """
+
+    def __init__(self, package: str, classes: dict[str, tuple[str, str]]) -> None:
+        """Initialize the registry with the (module, class name) per widget."""
+        self._package = package
+        self._classes = classes
+        self._loaded: dict[str, type[_T]] = {}
+
+    def __getitem__(self, widget: str) -> type[_T]:
+        """Return the class of a widget, of which the module has been loaded."""
+        return self._loaded[widget]
+
+    async def async_load(self, hass: HomeAssistant, widgets: Iterable[str]) -> None:
+        """Import the modules of the widgets which have not been loaded yet."""
+        if widgets := {
+            widget
+            for widget in widgets
+            if widget in self._classes and widget not in self._loaded
+        }:
+            # Importing blocks the event loop
+            await hass.async_add_executor_job(self._load, widgets)
+
+    def _load(self, widgets: set[str]) -> None:
+        """Import the modules of the widgets, to be run in the executor."""
+        for widget in widgets:
+            module_name, class_name = self._classes[widget]
+            module = importlib.import_module(f".{module_name}", self._package)
+            self._loaded[widget] = getattr(module, class_name)
+
+    def __contains__(self, widget: object) -> bool:
+        """Return True if a class is registered for the widget."""
+        return widget in self._classes
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the registered widgets."""
+        return iter(self._classes)
+
+    def __len__(self) -> int:
+        """Return the number of registered widgets."""
+        return len(self._classes)
@@ -4,6 +4,7 @@ from __future__ import annotations
 from typing import Any, cast
 
 from pyoverkiz.enums import OverkizCommand, OverkizCommandParam, OverkizState
+from pyoverkiz.models import Device
 
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
@@ -15,10 +16,10 @@ from homeassistant.components.light import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeAssistantOverkizData
+from . import HomeAssistantOverkizData, async_setup_device_entities
 from .const import DOMAIN
 from .coordinator import OverkizDataUpdateCoordinator
 from .entity import OverkizEntity
@@ -32,10 +33,14 @@ async def async_setup_entry(
     """Set up the Overkiz lights from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        OverkizLight(device.device_url, data.coordinator)
-        for device in data.platforms[Platform.LIGHT]
-    )
+    @callback
+    def async_add_lights(devices: list[Device]) -> None:
+        """Add Overkiz lights for the given devices."""
+        async_add_entities(
+            OverkizLight(device.device_url, data.coordinator) for device in devices
+        )
+
+    async_setup_device_entities(hass, entry, Platform.LIGHT, async_add_lights)
 
 
 class OverkizLight(OverkizEntity, LightEntity):
@@ -4,14 +4,15 @@ from __future__ import annotations
 from typing import Any
 
 from pyoverkiz.enums import OverkizCommand, OverkizCommandParam, OverkizState
+from pyoverkiz.models import Device
 
 from homeassistant.components.lock import LockEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeAssistantOverkizData
+from . import HomeAssistantOverkizData, async_setup_device_entities
 from .const import DOMAIN
 from .entity import OverkizEntity
 
@@ -24,10 +25,14 @@ async def async_setup_entry(
     """Set up the Overkiz locks from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        OverkizLock(device.device_url, data.coordinator)
-        for device in data.platforms[Platform.LOCK]
-    )
+    @callback
+    def async_add_locks(devices: list[Device]) -> None:
+        """Add Overkiz locks for the given devices."""
+        async_add_entities(
+            OverkizLock(device.device_url, data.coordinator) for device in devices
+        )
+
+    async_setup_device_entities(hass, entry, Platform.LOCK, async_add_locks)
 
 
 class OverkizLock(OverkizEntity, LockEntity):
@@ -0,0 +1,217 @@
+"""Rate limiter for the Overkiz API."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from enum import IntEnum
+from functools import partial
+import heapq
+import itertools
+import time
+from typing import Any, TypeVar, cast
+
+from pyoverkiz.exceptions import TooManyRequestsException
+
+from .const import LOGGER
+
+_T = TypeVar("_T")
+
+# The rate is reduced by this factor for every rate limited (429) response,
+# and recovers by RATE_RECOVERY for every successful response
+RATE_DECREASE_FACTOR = 0.5
+RATE_RECOVERY = 0.05
+MIN_RATE_FACTOR = 0.1
+
+
+class Priority(IntEnum):
+    """Priority lanes of API calls, lowest value first."""
+
+    COMMAND = 0
+    POLLING = 1
+    DIAGNOSTICS = 2
+
+
+class OverkizRateLimiter:
+    """Token bucket shared by all calls to the Overkiz API.
+
+    Waiting calls are served by priority, so commands are not delayed by
+    polling or diagnostics. When the API reports too many requests, calls are
+    paused and the rate is reduced until requests succeed again.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        *,
+        min_backoff: float,
+        max_backoff: float,
+    ) -> None:
+        """Initialize the rate limiter with a rate in requests per second."""
+        self.rate = rate
+        self.burst = burst
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+        self.rate_factor = 1.0
+        self.rate_limited_count = 0
+        self._backoff = 0.0
+        self._paused_until = 0.0
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._in_flight: dict[tuple[Any, ...], asyncio.Task[Any]] = {}
+
+    async def async_call(
+        self,
+        priority: Priority,
+        function: Callable[..., Awaitable[_T]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> _T:
+        """Call an API function once the rate limit allows it."""
+        await self.async_acquire(priority)
+
+        return await self.async_call_acquired(function, *args, **kwargs)
+
+    async def async_call_acquired(
+        self,
+        function: Callable[..., Awaitable[_T]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> _T:
+        """Call an API function of which the request has been acquired."""
+        try:
+            result = await function(*args, **kwargs)
+        except TooManyRequestsException:
+            self.report_too_many_requests()
+            raise
+
+        self.report_success()
+
+        return result
+
+    async def async_call_once(
+        self,
+        priority: Priority,
+        function: Callable[..., Awaitable[_T]],
+        *args: Any,
+    ) -> _T:
+        """Call an API function, sharing an identical in-flight call if any.
+
+        Concurrent callers (e.g. a relogin during setup, or a burst of stop
+        presses) share a single request and its result or exception.
+        """
+        key = (function, args)
+
+        if (task := self._in_flight.get(key)) is None:
+            task = asyncio.create_task(self.async_call(priority, function, *args))
+            self._in_flight[key] = task
+            task.add_done_callback(partial(self._call_done, key))
+
+        return cast(_T, await asyncio.shield(task))
+
+    def _call_done(self, key: tuple[Any, ...], task: asyncio.Task[Any]) -> None:
+        """Remove a finished shared call."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        # Avoid "exception never retrieved" when all callers have been cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def async_acquire(self, priority: Priority) -> None:
+        """Wait until a request of the given priority can be made."""
+        self._refill()
+
+        if not self._waiters and self._can_take_token():
+            self._tokens -= 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The token was granted, but will not be used
+                self._tokens += 1
+            self._dispatch()
+            raise
+
+    def report_success(self) -> None:
+        """Slowly recover the rate after a successful request."""
+        self._backoff = 0.0
+        self.rate_factor = min(1.0, self.rate_factor + RATE_RECOVERY)
+
+    def report_too_many_requests(self) -> None:
+        """Pause requests and reduce the rate after a rate limited request."""
+        self.rate_limited_count += 1
+        self._backoff = min(self.max_backoff, max(self.min_backoff, self._backoff * 2))
+        self._paused_until = time.monotonic() + self._backoff
+        self._tokens = 0.0
+        self.rate_factor = max(MIN_RATE_FACTOR, self.rate_factor * RATE_DECREASE_FACTOR)
+
+        LOGGER.debug(
+            "Too many requests, pausing requests for %ss (rate factor %s)",
+            self._backoff,
+            self.rate_factor,
+        )
+
+    @property
+    def current_rate(self) -> float:
+        """Return the current rate in requests per second."""
+        return self.rate * self.rate_factor
+
+    def _can_take_token(self) -> bool:
+        """Return True if a token is available and requests are not paused."""
+        return self._tokens >= 1 and time.monotonic() >= self._paused_until
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+
+        if now > self._paused_until:
+            self._tokens = min(
+                self.burst,
+                self._tokens
+                + (now - max(self._last_refill, self._paused_until))
+                * self.current_rate,
+            )
+
+        self._last_refill = now
+
+    def _dispatch(self) -> None:
+        """Grant tokens to waiting requests by priority."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        self._refill()
+
+        while self._waiters and self._can_take_token():
+            _, _, future = heapq.heappop(self._waiters)
+
+            if future.done():
+                continue
+
+            self._tokens -= 1
+            future.set_result(None)
+
+        # Drop cancelled requests
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+
+        if not self._waiters:
+            return
+
+        delay = max(
+            self._paused_until - time.monotonic(),
+            (1 - self._tokens) / self.current_rate,
+        )
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 from typing import Any
 
-from pyoverkiz.client import OverkizClient
 from pyoverkiz.models import Scenario
 
 from homeassistant.components.scene import Scene
@@ -13,6 +12,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import HomeAssistantOverkizData
 from .const import DOMAIN
+from .coordinator import OverkizDataUpdateCoordinator
+from .rate_limiter import Priority
 
 
 async def async_setup_entry(
@@ -24,20 +25,26 @@ async def async_setup_entry(
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
 
     async_add_entities(
-        OverkizScene(scene, data.coordinator.client) for scene in data.scenarios
+        OverkizScene(scene, data.coordinator) for scene in data.scenarios
     )
 
 
 class OverkizScene(Scene):
     """Representation of an Overkiz Scene."""
 
-    def __init__(self, scenario: Scenario, client: OverkizClient) -> None:
+    def __init__(
+        self, scenario: Scenario, coordinator: OverkizDataUpdateCoordinator
+    ) -> None:
         """Initialize the scene."""
         self.scenario = scenario
-        self.client = client
+        self.coordinator = coordinator
         self._attr_name = self.scenario.label
         self._attr_unique_id = self.scenario.oid
 
     async def async_activate(self, **kwargs: Any) -> None:
         """Activate the scene."""
-        await self.client.execute_scenario(self.scenario.oid)
+        await self.coordinator.rate_limiter.async_call(
+            Priority.COMMAND,
+            self.coordinator.client.execute_scenario,
+            self.scenario.oid,
+        )
@@ -8,12 +8,13 @@ from pyoverkiz.enums import OverkizCommand, OverkizCommandParam, OverkizState
 
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeAssistantOverkizData
-from .const import DOMAIN, IGNORED_OVERKIZ_DEVICES
+from . import HomeAssistantOverkizData, async_setup_definition_entities
+from .const import DOMAIN
+from .coordinator import OverkizDefinitionIndex
 from .entity import OverkizDescriptiveEntity, OverkizDeviceClass
 
 
@@ -88,6 +89,11 @@ SELECT_DESCRIPTIONS: list[OverkizSelectDescription] = [
 SUPPORTED_STATES = {description.key: description for description in SELECT_DESCRIPTIONS}
 
 
+def has_entities(index: OverkizDefinitionIndex) -> bool:
+    """Return True if one of the indexed devices has a select entity."""
+    return any(index.with_state(state_name) for state_name in SUPPORTED_STATES)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -95,26 +101,17 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Overkiz select from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
-    entities: list[OverkizSelect] = []
-
-    for device in data.coordinator.data.values():
-        if (
-            device.widget in IGNORED_OVERKIZ_DEVICES
-            or device.ui_class in IGNORED_OVERKIZ_DEVICES
-        ):
-            continue
-
-        for state in device.definition.states:
-            if description := SUPPORTED_STATES.get(state.qualified_name):
-                entities.append(
-                    OverkizSelect(
-                        device.device_url,
-                        data.coordinator,
-                        description,
-                    )
-                )
-
-    async_add_entities(entities)
+
+    @callback
+    def async_add_selects(index: OverkizDefinitionIndex) -> None:
+        """Add Overkiz select entities for the indexed devices."""
+        async_add_entities(
+            OverkizSelect(device_url, data.coordinator, description)
+            for state_name, description in SUPPORTED_STATES.items()
+            for device_url in index.with_state(state_name)
+        )
+
+    async_setup_definition_entities(hass, entry, async_add_selects)
 
 
 class OverkizSelect(OverkizDescriptiveEntity, SelectEntity):
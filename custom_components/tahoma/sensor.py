@@ -27,14 +27,14 @@ from homeassistant.const import (
     VOLUME_FLOW_RATE_CUBIC_METERS_PER_HOUR,
     VOLUME_LITERS,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
-from . import HomeAssistantOverkizData
-from .const import DOMAIN, IGNORED_OVERKIZ_DEVICES, OVERKIZ_STATE_TO_TRANSLATION
-from .coordinator import OverkizDataUpdateCoordinator
+from . import HomeAssistantOverkizData, async_setup_definition_entities
+from .const import DOMAIN, OVERKIZ_STATE_TO_TRANSLATION
+from .coordinator import OverkizDataUpdateCoordinator, OverkizDefinitionIndex
 from .entity import OverkizDescriptiveEntity, OverkizDeviceClass, OverkizEntity
 
 
@@ -385,6 +385,13 @@ SENSOR_DESCRIPTIONS: list[OverkizSensorDescription] = [
 SUPPORTED_STATES = {description.key: description for description in SENSOR_DESCRIPTIONS}
 
 
+def has_entities(index: OverkizDefinitionIndex) -> bool:
+    """Return True if one of the indexed devices has a sensor."""
+    return bool(index.with_widget(UIWidget.HOMEKIT_STACK)) or any(
+        index.with_state(state_name) for state_name in SUPPORTED_STATES
+    )
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -392,34 +399,24 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Overkiz sensors from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
-    entities: list[SensorEntity] = []
-
-    for device in data.coordinator.data.values():
-        if device.widget == UIWidget.HOMEKIT_STACK:
-            entities.append(
-                OverkizHomeKitSetupCodeSensor(
-                    device.device_url,
-                    data.coordinator,
-                )
-            )
-
-        if (
-            device.widget in IGNORED_OVERKIZ_DEVICES
-            or device.ui_class in IGNORED_OVERKIZ_DEVICES
-        ):
-            continue
-
-        for state in device.definition.states:
-            if description := SUPPORTED_STATES.get(state.qualified_name):
-                entities.append(
-                    OverkizStateSensor(
-                        device.device_url,
-                        data.coordinator,
-                        description,
-                    )
-                )
-
-    async_add_entities(entities)
+
+    @callback
+    def async_add_sensors(index: OverkizDefinitionIndex) -> None:
+        """Add Overkiz sensors for the indexed devices."""
+        entities: list[SensorEntity] = [
+            OverkizHomeKitSetupCodeSensor(device_url, data.coordinator)
+            for device_url in index.with_widget(UIWidget.HOMEKIT_STACK)
+        ]
+
+        entities += [
+            OverkizStateSensor(device_url, data.coordinator, description)
+            for state_name, description in SUPPORTED_STATES.items()
+            for device_url in index.with_state(state_name)
+        ]
+
+        async_add_entities(entities)
+
+    async_setup_definition_entities(hass, entry, async_add_sensors)
 
 
 class OverkizStateSensor(OverkizDescriptiveEntity, SensorEntity):
@@ -3,6 +3,7 @@ from typing import Any
 
 from pyoverkiz.enums import OverkizState
 from pyoverkiz.enums.command import OverkizCommand, OverkizCommandParam
+from pyoverkiz.models import Device
 
 from homeassistant.components.siren import SirenEntity
 from homeassistant.components.siren.const import (
@@ -13,10 +14,10 @@ from homeassistant.components.siren.const import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeAssistantOverkizData
+from . import HomeAssistantOverkizData, async_setup_device_entities
 from .const import DOMAIN
 from .entity import OverkizEntity
 
@@ -29,10 +30,14 @@ async def async_setup_entry(
     """Set up the Overkiz sirens from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        OverkizSiren(device.device_url, data.coordinator)
-        for device in data.platforms[Platform.SIREN]
-    )
+    @callback
+    def async_add_sirens(devices: list[Device]) -> None:
+        """Add Overkiz sirens for the given devices."""
+        async_add_entities(
+            OverkizSiren(device.device_url, data.coordinator) for device in devices
+        )
+
+    async_setup_device_entities(hass, entry, Platform.SIREN, async_add_sirens)
 
 
 class OverkizSiren(OverkizEntity, SirenEntity):
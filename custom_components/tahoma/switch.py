@@ -7,6 +7,7 @@ from typing import Any
 
 from pyoverkiz.enums import OverkizCommand, OverkizCommandParam, OverkizState
 from pyoverkiz.enums.ui import UIClass, UIWidget
+from pyoverkiz.models import Device
 from pyoverkiz.types import StateType as OverkizStateType
 
 from homeassistant.components.switch import (
@@ -16,11 +17,11 @@ from homeassistant.components.switch import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeAssistantOverkizData
+from . import HomeAssistantOverkizData, async_setup_device_entities
 from .const import DOMAIN
 from .entity import OverkizDescriptiveEntity
 
@@ -122,21 +123,27 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Overkiz switch from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
-    entities: list[OverkizSwitch] = []
-
-    for device in data.platforms[Platform.SWITCH]:
-        if description := SUPPORTED_DEVICES.get(device.widget) or SUPPORTED_DEVICES.get(
-            device.ui_class
-        ):
-            entities.append(
-                OverkizSwitch(
-                    device.device_url,
-                    data.coordinator,
-                    description,
+
+    @callback
+    def async_add_switches(devices: list[Device]) -> None:
+        """Add Overkiz switches for the given devices."""
+        entities: list[OverkizSwitch] = []
+
+        for device in devices:
+            if description := SUPPORTED_DEVICES.get(
+                device.widget
+            ) or SUPPORTED_DEVICES.get(device.ui_class):
+                entities.append(
+                    OverkizSwitch(
+                        device.device_url,
+                        data.coordinator,
+                        description,
+                    )
                 )
-            )
 
-    async_add_entities(entities)
+        async_add_entities(entities)
+
+    async_setup_device_entities(hass, entry, Platform.SWITCH, async_add_switches)
 
 
 class OverkizSwitch(OverkizDescriptiveEntity, SwitchEntity):
@@ -1,22 +1,28 @@
 """Support for Overkiz water heater devices."""
 from pyoverkiz.enums import UIWidget
+from pyoverkiz.models import Device
 
+from homeassistant.components.water_heater import WaterHeaterEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import HomeAssistantOverkizData
+from . import HomeAssistantOverkizData, async_setup_device_entities
 from .const import DOMAIN
-from .water_heater_devices.domestic_hot_water_production import (
-    DomesticHotWaterProduction,
-)
-from .water_heater_devices.hitachi_dhw import HitachiDHW
+from .lazy_registry import LazyClassRegistry
 
-TYPE = {
-    UIWidget.DOMESTIC_HOT_WATER_PRODUCTION: DomesticHotWaterProduction,
-    UIWidget.HITACHI_DHW: HitachiDHW,
-}
+# Implementations are imported the first time a device of the widget is seen
+TYPE: LazyClassRegistry[WaterHeaterEntity] = LazyClassRegistry(
+    f"{__package__}.water_heater_devices",
+    {
+        UIWidget.DOMESTIC_HOT_WATER_PRODUCTION: (
+            "domestic_hot_water_production",
+            "DomesticHotWaterProduction",
+        ),
+        UIWidget.HITACHI_DHW: ("hitachi_dhw", "HitachiDHW"),
+    },
+)
 
 
 async def async_setup_entry(
@@ -27,11 +33,19 @@ async def async_setup_entry(
     """Set up the Overkiz water heater from a config entry."""
     data: HomeAssistantOverkizData = hass.data[DOMAIN][entry.entry_id]
 
-    water_heater_devices = [device for device in data.platforms[Platform.WATER_HEATER]]
+    @callback
+    def async_add_water_heaters(devices: list[Device]) -> None:
+        """Add Overkiz water heaters for the given devices."""
+        entities = [
+            TYPE[device.widget](device.device_url, data.coordinator)
+            for device in devices
+            if device.widget in TYPE
+        ]
+        async_add_entities(entities)
 
-    entities = [
-        TYPE[device.widget](device.device_url, data.coordinator)
-        for device in water_heater_devices
-        if device.widget in TYPE
-    ]
-    async_add_entities(entities)
+    await TYPE.async_load(
+        hass, (device.widget for device in data.platforms[Platform.WATER_HEATER])
+    )
+    async_setup_device_entities(
+        hass, entry, Platform.WATER_HEATER, async_add_water_heaters, TYPE
+    )
@@ -1 +1,36 @@
 """Tests for the Somfy TaHoma integration."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import humps
+from pyoverkiz.models import Device, Place
+
+from custom_components.tahoma.const import UPDATE_INTERVAL
+from custom_components.tahoma.coordinator import OverkizDataUpdateCoordinator
+from homeassistant.core import HomeAssistant
+
+from .fake_overkiz import raw_setup
+
+
+def create_coordinator(
+    hass: HomeAssistant, client: Any, devices: list[Device], **kwargs: Any
+) -> OverkizDataUpdateCoordinator:
+    """Return a coordinator of the devices, placed in the root place of the setup.
+
+    Keyword arguments override the arguments of the coordinator.
+    """
+    return OverkizDataUpdateCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        **{
+            "name": "device events",
+            "client": client,
+            "devices": devices,
+            "places": Place(**humps.decamelize(raw_setup()["rootPlace"])),
+            "update_interval": UPDATE_INTERVAL,
+            "config_entry_id": "test",
+            **kwargs,
+        },
+    )
@@ -0,0 +1,379 @@
+"""Fake Overkiz servers, serving the cloud and local (developer mode) API for tests."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+import time
+from typing import Any
+import uuid
+
+from aiohttp import web
+from pyoverkiz.const import LOCAL_API_PATH
+from pyoverkiz.enums import EventName, ExecutionState
+from pyoverkiz.models import OverkizServer
+
+TEST_GATEWAY_ID = "1234-5678-9123"
+TEST_TOKEN = "test-token"
+TEST_USERNAME = "test@example.com"
+TEST_PASSWORD = "test-password"
+
+CLOUD_API_PATH = "/enduser-mobile-web/enduserAPI/"
+SESSION_COOKIE = "JSESSIONID"
+
+
+def raw_device(index: int) -> dict[str, Any]:
+    """Return a roller shutter as returned by the Overkiz API."""
+    return {
+        "deviceURL": f"io://{TEST_GATEWAY_ID}/{index}",
+        "available": True,
+        "enabled": True,
+        "label": f"Shutter {index}",
+        "controllableName": "io:RollerShutterGenericIOComponent",
+        "definition": {
+            "commands": [
+                {"commandName": "close", "nparams": 0},
+                {"commandName": "open", "nparams": 0},
+                {"commandName": "setClosure", "nparams": 1},
+            ],
+            "states": [
+                {"qualifiedName": "core:ClosureState", "type": "ContinuousState"}
+            ],
+        },
+        "widget": "PositionableRollerShutter",
+        "uiClass": "RollerShutter",
+        "states": [{"name": "core:ClosureState", "type": 1, "value": 20}],
+        "type": 1,
+        "placeOID": "place",
+    }
+
+
+def raw_setup(*devices: dict[str, Any], local: bool = False) -> dict[str, Any]:
+    """Return a setup as returned by the Overkiz API.
+
+    The setup of the local API has no places.
+    """
+    setup: dict[str, Any] = {"gateways": [raw_gateway()], "devices": list(devices)}
+
+    if not local:
+        setup["rootPlace"] = {
+            "creationTime": 0,
+            "label": "House",
+            "type": 0,
+            "oid": "place",
+            "subPlaces": [],
+        }
+
+    return setup
+
+
+def raw_gateway() -> dict[str, Any]:
+    """Return a gateway as returned by the Overkiz API."""
+    return {
+        "gatewayId": TEST_GATEWAY_ID,
+        "type": 98,
+        "subType": 1,
+        "alive": True,
+        "connectivity": {"status": "OK", "protocolVersion": "2022.4.4"},
+    }
+
+
+def raw_scenario(index: int) -> dict[str, Any]:
+    """Return a scenario (action group) as returned by the Overkiz API."""
+    return {"label": f"Scenario {index}", "oid": f"scenario-{index}", "actions": []}
+
+
+def _error(status: int, error_code: str, error: str) -> web.Response:
+    """Return an error response of the Overkiz API."""
+    return web.json_response({"errorCode": error_code, "error": error}, status=status)
+
+
+class FakeOverkizServer(ABC):
+    """Fake Overkiz server with scriptable events, latency and failures.
+
+    Events are appended to `events` and returned by the next fetch. Failures
+    are injected via `too_many_requests` (number of requests to reject),
+    `maintenance`, `expire_listener` and `expire_session`.
+    """
+
+    api_path = ""
+
+    def __init__(self, *devices: dict[str, Any]) -> None:
+        """Initialize the fake server."""
+        self.devices = list(devices)
+        self.scenarios: list[dict[str, Any]] = []
+        self.events: list[dict[str, Any]] = []
+        self.executions: dict[str, dict[str, Any]] = {}
+        self.history: list[dict[str, Any]] = []
+        self.latency = 0.0
+        self.maintenance = False
+        self.too_many_requests = 0
+        self.listener_id: str | None = None
+        self.requests: list[str] = []
+
+    @property
+    def app(self) -> web.Application:
+        """Return the aiohttp application of the server."""
+        app = web.Application(middlewares=[self._middleware])
+        app.add_routes(
+            [
+                web.route(method, f"{self.api_path}{path}", handler)
+                for method, path, handler in self._routes()
+            ]
+        )
+
+        return app
+
+    @classmethod
+    def server(cls, host: str) -> OverkizServer:
+        """Return the Overkiz server pointing to the fake server."""
+        return OverkizServer(
+            name="Fake server",
+            endpoint=f"http://{host}{cls.api_path}",
+            manufacturer="Somfy",
+            configuration_url=None,
+        )
+
+    def expire_listener(self) -> None:
+        """Drop the event listener, like the server does after inactivity."""
+        self.listener_id = None
+
+    def expire_session(self) -> None:
+        """Drop the authenticated session."""
+        self.expire_listener()
+
+    def complete_executions(self) -> None:
+        """Complete the running executions, and add them to the history."""
+        for exec_id, action_group in self.executions.items():
+            self.events.append(
+                {
+                    "name": EventName.EXECUTION_STATE_CHANGED,
+                    "execId": exec_id,
+                    "oldState": ExecutionState.IN_PROGRESS,
+                    "newState": ExecutionState.COMPLETED,
+                }
+            )
+            self.history.append(self._history_execution(exec_id, action_group))
+
+        self.executions.clear()
+
+    def _routes(self) -> list[tuple[str, str, Any]]:
+        """Return the (method, path, handler) of the endpoints."""
+        return [
+            ("GET", "setup", self._get_setup),
+            ("GET", "setup/devices", self._get_devices),
+            ("GET", "setup/devices/{device_url}", self._get_device),
+            ("GET", "setup/gateways", self._get_gateways),
+            ("POST", "events/register", self._register),
+            ("POST", "events/{listener_id}/fetch", self._fetch),
+            ("POST", "events/{listener_id}/unregister", self._unregister),
+            ("POST", "exec/apply", self._apply),
+            ("GET", "exec/current", self._current_executions),
+            ("DELETE", "exec/current/setup/{exec_id}", self._cancel),
+            # pyoverkiz cancels with a leading slash, which the servers accept
+            ("DELETE", "/exec/current/setup/{exec_id}", self._cancel),
+        ]
+
+    @abstractmethod
+    def _is_authenticated(self, request: web.Request) -> bool:
+        """Return True if the request is authenticated."""
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.Response:
+        """Delay responses, inject failures and check the authentication."""
+        self.requests.append(request.path.removeprefix(self.api_path))
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.maintenance:
+            return web.Response(
+                text="<html>Server is down for maintenance</html>", status=503
+            )
+
+        if self.too_many_requests:
+            self.too_many_requests -= 1
+            return _error(
+                429, "AUTHENTICATION_ERROR", "Too many requests, try again later"
+            )
+
+        if not self._is_authenticated(request):
+            return _error(401, "RESOURCE_ACCESS_DENIED", "Not authenticated")
+
+        return await handler(request)
+
+    async def _get_setup(self, _: web.Request) -> web.Response:
+        return web.json_response(raw_setup(*self.devices))
+
+    async def _get_devices(self, _: web.Request) -> web.Response:
+        return web.json_response(self.devices)
+
+    async def _get_device(self, request: web.Request) -> web.Response:
+        device_url = request.match_info["device_url"]
+
+        for device in self.devices:
+            if device["deviceURL"] == device_url:
+                return web.json_response(device)
+
+        return _error(400, "UNSPECIFIED_ERROR", "Unknown object")
+
+    async def _get_gateways(self, _: web.Request) -> web.Response:
+        return web.json_response([raw_gateway()])
+
+    async def _register(self, _: web.Request) -> web.Response:
+        self.listener_id = str(uuid.uuid4())
+        return web.json_response({"id": self.listener_id})
+
+    async def _fetch(self, request: web.Request) -> web.Response:
+        if self.listener_id is None:
+            return _error(400, "UNSPECIFIED_ERROR", "No registered event listener")
+
+        if request.match_info["listener_id"] != self.listener_id:
+            return _error(400, "UNSPECIFIED_ERROR", "Invalid event listener id")
+
+        events, self.events = self.events, []
+        return web.json_response(events)
+
+    async def _unregister(self, _: web.Request) -> web.Response:
+        self.listener_id = None
+        return web.json_response({})
+
+    async def _apply(self, request: web.Request) -> web.Response:
+        exec_id = str(uuid.uuid4())
+        self.executions[exec_id] = await request.json()
+        self.events.append({"name": EventName.EXECUTION_REGISTERED, "execId": exec_id})
+        return web.json_response({"execId": exec_id})
+
+    async def _current_executions(self, _: web.Request) -> web.Response:
+        return web.json_response(
+            [
+                {
+                    "id": exec_id,
+                    "description": "Execution",
+                    "owner": TEST_USERNAME,
+                    "state": ExecutionState.IN_PROGRESS,
+                    "actionGroup": action_group,
+                }
+                for exec_id, action_group in self.executions.items()
+            ]
+        )
+
+    async def _cancel(self, request: web.Request) -> web.Response:
+        self.executions.pop(request.match_info["exec_id"], None)
+        return web.json_response({})
+
+    @staticmethod
+    def _history_execution(
+        exec_id: str, action_group: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Return an execution as returned by the execution history."""
+        now = int(time.time() * 1000)
+
+        return {
+            "id": exec_id,
+            "eventTime": now,
+            "owner": TEST_USERNAME,
+            "source": "mobile:Home Assistant",
+            "endTime": now,
+            "effectiveStartTime": now,
+            "duration": 0,
+            "label": action_group.get("label"),
+            "type": "Immediate execution",
+            "state": ExecutionState.COMPLETED,
+            "failureType": "NO_FAILURE",
+            "commands": [
+                {
+                    "deviceURL": action["deviceURL"],
+                    "command": command["name"],
+                    "parameters": command.get("parameters"),
+                    "rank": rank,
+                    "dynamic": False,
+                    "state": ExecutionState.COMPLETED,
+                    "failureType": "NO_FAILURE",
+                }
+                for action in action_group["actions"]
+                for rank, command in enumerate(action["commands"])
+            ],
+            "executionType": "Immediate execution",
+            "executionSubType": "MANUAL_CONTROL",
+        }
+
+
+class FakeOverkizGateway(FakeOverkizServer):
+    """Fake Overkiz gateway, serving the local API with a token."""
+
+    api_path = LOCAL_API_PATH
+
+    async def _get_setup(self, _: web.Request) -> web.Response:
+        return web.json_response(raw_setup(*self.devices, local=True))
+
+    def _is_authenticated(self, request: web.Request) -> bool:
+        """Return True if the request has a valid token."""
+        return request.headers.get("Authorization") == f"Bearer {TEST_TOKEN}"
+
+
+class FakeOverkizCloud(FakeOverkizServer):
+    """Fake Overkiz cloud server, authenticating with a session cookie."""
+
+    api_path = CLOUD_API_PATH
+
+    def __init__(self, *devices: dict[str, Any]) -> None:
+        """Initialize the fake cloud server."""
+        super().__init__(*devices)
+        self.session_id: str | None = None
+        self.logins = 0
+
+    def expire_session(self) -> None:
+        """Drop the authenticated session, and its event listener."""
+        super().expire_session()
+        self.session_id = None
+
+    def _routes(self) -> list[tuple[str, str, Any]]:
+        """Return the (method, path, handler) of the endpoints."""
+        return [
+            *super()._routes(),
+            ("POST", "login", self._login),
+            ("GET", "actionGroups", self._get_scenarios),
+            ("GET", "history/executions", self._get_history),
+            ("POST", "exec/{oid}", self._execute_scenario),
+        ]
+
+    def _is_authenticated(self, request: web.Request) -> bool:
+        """Return True if the request has a valid session cookie."""
+        if request.path == f"{self.api_path}login":
+            return True
+
+        return (
+            self.session_id is not None
+            and request.cookies.get(SESSION_COOKIE) == self.session_id
+        )
+
+    async def _login(self, request: web.Request) -> web.Response:
+        data = await request.post()
+
+        if (data.get("userId"), data.get("userPassword")) != (
+            TEST_USERNAME,
+            TEST_PASSWORD,
+        ):
+            return _error(401, "AUTHENTICATION_ERROR", "Bad credentials")
+
+        self.logins += 1
+        self.session_id = str(uuid.uuid4())
+        response = web.json_response({"success": True, "roles": []})
+        response.set_cookie(SESSION_COOKIE, self.session_id)
+
+        return response
+
+    async def _get_scenarios(self, _: web.Request) -> web.Response:
+        return web.json_response(self.scenarios)
+
+    async def _get_history(self, _: web.Request) -> web.Response:
+        return web.json_response(self.history)
+
+    async def _execute_scenario(self, request: web.Request) -> web.Response:
+        exec_id = str(uuid.uuid4())
+        self.executions[exec_id] = {
+            "label": request.match_info["oid"],
+            "actions": [],
+        }
+        self.events.append({"name": EventName.EXECUTION_REGISTERED, "execId": exec_id})
+        return web.json_response({"execId": exec_id})
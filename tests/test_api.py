@@ -0,0 +1,132 @@
+"""Tests for the Overkiz (by Somfy) API endpoints, using the fake servers."""
+from __future__ import annotations
+
+from pyoverkiz.client import OverkizClient
+from pyoverkiz.models import Command
+import pytest
+
+from custom_components.tahoma import api
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .fake_overkiz import (
+    TEST_PASSWORD,
+    TEST_TOKEN,
+    TEST_USERNAME,
+    FakeOverkizCloud,
+    FakeOverkizGateway,
+    raw_device,
+    raw_scenario,
+    raw_setup,
+)
+
+TEST_DEVICE_URL = raw_device(1)["deviceURL"]
+TEST_DEVICE_URL2 = raw_device(2)["deviceURL"]
+
+# The fake servers are served on a local socket
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+async def _gateway_client(
+    hass: HomeAssistant, aiohttp_server, gateway: FakeOverkizGateway
+) -> OverkizClient:
+    """Return a client using the fake gateway."""
+    server = await aiohttp_server(gateway.app)
+    client = OverkizClient(
+        username="",
+        password="",
+        token=TEST_TOKEN,
+        session=async_create_clientsession(hass),
+        server=FakeOverkizGateway.server(f"{server.host}:{server.port}"),
+        verify_ssl=False,
+    )
+    await client.login()
+
+    return client
+
+
+async def _cloud_client(
+    hass: HomeAssistant, aiohttp_server, cloud: FakeOverkizCloud
+) -> OverkizClient:
+    """Return a client logged in to the fake cloud server."""
+    server = await aiohttp_server(cloud.app)
+    # Cookies are not accepted from IP addresses
+    client = OverkizClient(
+        username=TEST_USERNAME,
+        password=TEST_PASSWORD,
+        session=async_create_clientsession(hass),
+        server=FakeOverkizCloud.server(f"localhost:{server.port}"),
+    )
+    await client.login()
+
+    return client
+
+
+async def test_get_raw_setup(hass: HomeAssistant, aiohttp_server) -> None:
+    """Test the raw setup is returned as served."""
+    gateway = FakeOverkizGateway(raw_device(1))
+    client = await _gateway_client(hass, aiohttp_server, gateway)
+
+    assert await api.get_raw_setup(client) == raw_setup(raw_device(1), local=True)
+
+
+async def test_get_raw_devices(hass: HomeAssistant, aiohttp_server) -> None:
+    """Test all raw devices, or a single one, are returned."""
+    gateway = FakeOverkizGateway(raw_device(1), raw_device(2))
+    client = await _gateway_client(hass, aiohttp_server, gateway)
+
+    assert await api.get_raw_devices(client) == [raw_device(1), raw_device(2)]
+    # The device URL is quoted into a single path segment
+    assert await api.get_raw_device(client, TEST_DEVICE_URL2) == raw_device(2)
+
+
+async def test_get_raw_scenarios(hass: HomeAssistant, aiohttp_server) -> None:
+    """Test the raw scenarios are returned by the cloud API."""
+    cloud = FakeOverkizCloud()
+    cloud.scenarios = [raw_scenario(1)]
+    client = await _cloud_client(hass, aiohttp_server, cloud)
+
+    assert await api.get_raw_scenarios(client) == [raw_scenario(1)]
+
+
+async def test_execute_action_group(hass: HomeAssistant, aiohttp_server) -> None:
+    """Test the commands of multiple devices are executed as a single action group."""
+    gateway = FakeOverkizGateway(raw_device(1), raw_device(2))
+    client = await _gateway_client(hass, aiohttp_server, gateway)
+
+    exec_id = await api.execute_action_group(
+        client,
+        {
+            TEST_DEVICE_URL: [Command("close")],
+            TEST_DEVICE_URL2: [Command("setClosure", [50])],
+        },
+        "Home Assistant",
+    )
+
+    assert gateway.executions[exec_id] == {
+        "label": "Home Assistant",
+        "actions": [
+            {
+                "deviceURL": TEST_DEVICE_URL,
+                "commands": [{"name": "close", "parameters": None}],
+            },
+            {
+                "deviceURL": TEST_DEVICE_URL2,
+                "commands": [{"name": "setClosure", "parameters": [50]}],
+            },
+        ],
+    }
+
+
+async def test_log_in_again(hass: HomeAssistant, aiohttp_server) -> None:
+    """Test the request is retried after logging in again when the session expired."""
+    cloud = FakeOverkizCloud(raw_device(1))
+    client = await _cloud_client(hass, aiohttp_server, cloud)
+    cloud.expire_session()
+
+    exec_id = await api.execute_action_group(
+        client, {TEST_DEVICE_URL: [Command("close")]}, "Home Assistant"
+    )
+
+    assert exec_id in cloud.executions
+    assert cloud.logins == 2
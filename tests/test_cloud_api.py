@@ -0,0 +1,180 @@
+"""Tests for the Overkiz (by Somfy) cloud API, using a fake cloud server."""
+from __future__ import annotations
+
+import humps
+from pyoverkiz.client import OverkizClient
+from pyoverkiz.enums import EventName, ExecutionState
+from pyoverkiz.models import Command, Device
+import pytest
+
+from custom_components.tahoma.coordinator import OverkizDataUpdateCoordinator
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from . import create_coordinator
+from .fake_overkiz import (
+    TEST_PASSWORD,
+    TEST_USERNAME,
+    FakeOverkizCloud,
+    raw_device,
+    raw_scenario,
+)
+
+TEST_DEVICE_URL = raw_device(1)["deviceURL"]
+
+# The fake cloud server is served on a local socket
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+async def _client(
+    hass: HomeAssistant, aiohttp_server, cloud: FakeOverkizCloud
+) -> OverkizClient:
+    """Return a client logged in to the fake cloud server."""
+    server = await aiohttp_server(cloud.app)
+    # Cookies are not accepted from IP addresses
+    client = OverkizClient(
+        username=TEST_USERNAME,
+        password=TEST_PASSWORD,
+        session=async_create_clientsession(hass),
+        server=FakeOverkizCloud.server(f"localhost:{server.port}"),
+    )
+    await client.login()
+
+    return client
+
+
+async def _coordinator(
+    hass: HomeAssistant, aiohttp_server, cloud: FakeOverkizCloud
+) -> OverkizDataUpdateCoordinator:
+    """Return a coordinator using the fake cloud server."""
+    coordinator = create_coordinator(
+        hass,
+        await _client(hass, aiohttp_server, cloud),
+        [Device(**humps.decamelize(device)) for device in cloud.devices],
+    )
+    coordinator.rate_limiter.min_backoff = 0.01
+
+    return coordinator
+
+
+def _closure_event(value: int) -> dict:
+    """Return a device state changed event of the closure state."""
+    return {
+        "name": EventName.DEVICE_STATE_CHANGED,
+        "deviceURL": TEST_DEVICE_URL,
+        "deviceStates": [{"name": "core:ClosureState", "type": 1, "value": value}],
+    }
+
+
+async def test_events_from_cloud_api(hass: HomeAssistant, aiohttp_server) -> None:
+    """Test events are fetched from the cloud API."""
+    cloud = FakeOverkizCloud(raw_device(1))
+    coordinator = await _coordinator(hass, aiohttp_server, cloud)
+    cloud.events.append(_closure_event(80))
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data[TEST_DEVICE_URL].states["core:ClosureState"].value == 80
+    assert cloud.logins == 1
+
+
+@pytest.mark.parametrize(
+    "failure, value", [("too_many_requests", 1), ("maintenance", True)]
+)
+async def test_update_fails_when_unavailable(
+    hass: HomeAssistant, aiohttp_server, failure: str, value: int | bool
+) -> None:
+    """Test updates fail when rate limited or in maintenance, and recover after."""
+    cloud = FakeOverkizCloud(raw_device(1))
+    coordinator = await _coordinator(hass, aiohttp_server, cloud)
+    setattr(cloud, failure, value)
+
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert coordinator.rate_limiter.rate_limited_count == (
+        failure == "too_many_requests"
+    )
+
+    cloud.maintenance = False
+    cloud.events.append(_closure_event(80))
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data[TEST_DEVICE_URL].states["core:ClosureState"].value == 80
+
+
+async def test_expired_listener_is_registered_again(
+    hass: HomeAssistant, aiohttp_server
+) -> None:
+    """Test a new event listener is registered when the server dropped it."""
+    cloud = FakeOverkizCloud(raw_device(1))
+    coordinator = await _coordinator(hass, aiohttp_server, cloud)
+    cloud.expire_listener()
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert cloud.requests.count("events/register") == 2
+    assert cloud.logins == 1
+
+
+async def test_expired_session_logs_in_again(
+    hass: HomeAssistant, aiohttp_server
+) -> None:
+    """Test the client logs in again when the server dropped the session."""
+    cloud = FakeOverkizCloud(raw_device(1))
+    coordinator = await _coordinator(hass, aiohttp_server, cloud)
+    cloud.expire_session()
+
+    await coordinator.async_refresh()
+    cloud.events.append(_closure_event(80))
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data[TEST_DEVICE_URL].states["core:ClosureState"].value == 80
+    assert cloud.logins == 2
+
+
+async def test_executions_and_history(hass: HomeAssistant, aiohttp_server) -> None:
+    """Test commands and scenarios are executed, cancelled and kept in history."""
+    cloud = FakeOverkizCloud(raw_device(1))
+    cloud.scenarios.append(raw_scenario(1))
+    client = await _client(hass, aiohttp_server, cloud)
+
+    exec_id = await client.execute_command(TEST_DEVICE_URL, Command("open"))
+    [scenario] = await client.get_scenarios()
+    await client.execute_scenario(scenario.oid)
+
+    executions = await client.get_current_executions()
+    assert {execution.id for execution in executions} == set(cloud.executions)
+    assert executions[0].action_group["actions"][0]["device_url"] == TEST_DEVICE_URL
+
+    await client.cancel_command(exec_id)
+    cloud.complete_executions()
+
+    [history] = await client.get_execution_history()
+    assert history.state == ExecutionState.COMPLETED
+    assert history.label == scenario.oid
+    assert [event.name for event in await client.fetch_events()] == [
+        EventName.EXECUTION_REGISTERED,
+        EventName.EXECUTION_REGISTERED,
+        EventName.EXECUTION_STATE_CHANGED,
+    ]
+
+
+async def test_updated_device_is_fetched(hass: HomeAssistant, aiohttp_server) -> None:
+    """Test only an updated device is fetched from the cloud API."""
+    cloud = FakeOverkizCloud(raw_device(1), raw_device(2))
+    coordinator = await _coordinator(hass, aiohttp_server, cloud)
+    cloud.devices[0]["label"] = "Renamed"
+    cloud.events.append(
+        {"name": EventName.DEVICE_UPDATED, "deviceURL": TEST_DEVICE_URL}
+    )
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.devices[TEST_DEVICE_URL].label == "Renamed"
+    assert "setup/devices" not in cloud.requests
@@ -77,6 +77,95 @@ async def test_form(hass: HomeAssistant) -> None:
     assert len(mock_setup_entry.mock_calls) == 1
 
 
+async def test_form_local_api(hass: HomeAssistant) -> None:
+    """Test a token is created and validated for the local API."""
+    result = await hass.config_entries.flow.async_init(
+        config_flow.DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    with patch("pyoverkiz.client.OverkizClient.login", return_value=True), patch(
+        "pyoverkiz.client.OverkizClient.get_gateways",
+        return_value=MOCK_GATEWAY_RESPONSE,
+    ):
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                "username": TEST_EMAIL,
+                "password": TEST_PASSWORD,
+                "hub": TEST_HUB,
+                "api_type": "local",
+            },
+        )
+
+    assert result2["type"] == data_entry_flow.RESULT_TYPE_FORM
+    assert result2["step_id"] == "local"
+
+    with patch("pyoverkiz.client.OverkizClient.login", return_value=True), patch(
+        "pyoverkiz.client.OverkizClient.generate_local_token", return_value="token"
+    ), patch("pyoverkiz.client.OverkizClient.activate_local_token"), patch(
+        "custom_components.tahoma.async_setup_entry", return_value=True
+    ):
+        result3 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {"host": "gateway-1234-5678-9123.local:8443", "verify_ssl": False},
+        )
+
+    assert result3["type"] == "create_entry"
+    assert result3["data"] == {
+        "username": TEST_EMAIL,
+        "password": TEST_PASSWORD,
+        "hub": TEST_HUB,
+        "api_type": "local",
+        "host": "gateway-1234-5678-9123.local:8443",
+        "token": "token",
+        "verify_ssl": False,
+    }
+
+
+async def test_form_local_api_token_is_reused(hass: HomeAssistant) -> None:
+    """Test the local API token is only created once when the form is resubmitted."""
+    result = await hass.config_entries.flow.async_init(
+        config_flow.DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    with patch("pyoverkiz.client.OverkizClient.login", return_value=True), patch(
+        "pyoverkiz.client.OverkizClient.get_gateways",
+        return_value=MOCK_GATEWAY_RESPONSE,
+    ):
+        await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                "username": TEST_EMAIL,
+                "password": TEST_PASSWORD,
+                "hub": TEST_HUB,
+                "api_type": "local",
+            },
+        )
+
+    with patch(
+        "pyoverkiz.client.OverkizClient.login", side_effect=[ClientError, True]
+    ), patch(
+        "pyoverkiz.client.OverkizClient.generate_local_token", return_value="token"
+    ) as generate_local_token, patch(
+        "pyoverkiz.client.OverkizClient.activate_local_token"
+    ) as activate_local_token, patch(
+        "custom_components.tahoma.async_setup_entry", return_value=True
+    ):
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"host": "unreachable:8443", "verify_ssl": False}
+        )
+        result3 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {"host": "gateway-1234-5678-9123.local:8443", "verify_ssl": False},
+        )
+
+    assert result2["errors"] == {"base": "cannot_connect"}
+    assert result3["type"] == "create_entry"
+    assert result3["data"]["token"] == "token"
+    generate_local_token.assert_called_once()
+    activate_local_token.assert_called_once()
+
+
 @pytest.mark.parametrize(
     "side_effect, error",
     [
@@ -352,3 +441,112 @@ async def test_reauth_wrong_account(hass):
 
         assert result["type"] == data_entry_flow.RESULT_TYPE_ABORT
         assert result["reason"] == "reauth_wrong_account"
+
+
+async def test_reauth_switch_to_local_api(hass: HomeAssistant) -> None:
+    """Test reauthentication with the local API asks for the gateway host."""
+    mock_entry = MockConfigEntry(
+        domain=config_flow.DOMAIN,
+        unique_id=TEST_GATEWAY_ID,
+        data={"username": TEST_EMAIL, "password": TEST_PASSWORD, "hub": TEST_HUB},
+    )
+    mock_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        config_flow.DOMAIN,
+        context={
+            "source": config_entries.SOURCE_REAUTH,
+            "unique_id": mock_entry.unique_id,
+            "entry_id": mock_entry.entry_id,
+        },
+        data=mock_entry.data,
+    )
+
+    with patch("pyoverkiz.client.OverkizClient.login", return_value=True), patch(
+        "pyoverkiz.client.OverkizClient.get_gateways",
+        return_value=MOCK_GATEWAY_RESPONSE,
+    ), patch(
+        "pyoverkiz.client.OverkizClient.generate_local_token", return_value="token"
+    ), patch(
+        "pyoverkiz.client.OverkizClient.activate_local_token"
+    ), patch(
+        "custom_components.tahoma.async_setup_entry", return_value=True
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input={
+                "username": TEST_EMAIL,
+                "password": TEST_PASSWORD2,
+                "hub": TEST_HUB,
+                "api_type": "local",
+            },
+        )
+
+        assert result["type"] == data_entry_flow.RESULT_TYPE_FORM
+        assert result["step_id"] == "local"
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {"host": "gateway-1234-5678-9123.local:8443", "verify_ssl": False},
+        )
+
+    assert result["type"] == data_entry_flow.RESULT_TYPE_ABORT
+    assert result["reason"] == "reauth_successful"
+    assert mock_entry.data == {
+        "username": TEST_EMAIL,
+        "password": TEST_PASSWORD2,
+        "hub": TEST_HUB,
+        "api_type": "local",
+        "host": "gateway-1234-5678-9123.local:8443",
+        "token": "token",
+        "verify_ssl": False,
+    }
+
+
+async def test_reauth_switch_to_cloud_api(hass: HomeAssistant) -> None:
+    """Test reauthentication with the cloud API drops the local API settings."""
+    mock_entry = MockConfigEntry(
+        domain=config_flow.DOMAIN,
+        unique_id=TEST_GATEWAY_ID,
+        data={
+            "username": TEST_EMAIL,
+            "password": TEST_PASSWORD,
+            "hub": TEST_HUB,
+            "api_type": "local",
+            "host": "gateway-1234-5678-9123.local:8443",
+            "token": "token",
+            "verify_ssl": False,
+        },
+    )
+    mock_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        config_flow.DOMAIN,
+        context={
+            "source": config_entries.SOURCE_REAUTH,
+            "unique_id": mock_entry.unique_id,
+            "entry_id": mock_entry.entry_id,
+        },
+        data=mock_entry.data,
+    )
+
+    with patch("pyoverkiz.client.OverkizClient.login", return_value=True), patch(
+        "pyoverkiz.client.OverkizClient.get_gateways",
+        return_value=MOCK_GATEWAY_RESPONSE,
+    ), patch("custom_components.tahoma.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input={
+                "username": TEST_EMAIL,
+                "password": TEST_PASSWORD2,
+                "hub": TEST_HUB,
+                "api_type": "cloud",
+            },
+        )
+
+    assert result["type"] == data_entry_flow.RESULT_TYPE_ABORT
+    assert result["reason"] == "reauth_successful"
+    assert "api_type" not in mock_entry.data
+    assert "host" not in mock_entry.data
+    assert "token" not in mock_entry.data
+    assert mock_entry.data["password"] == TEST_PASSWORD2
@@ -0,0 +1,489 @@
+"""Tests for the Overkiz (by Somfy) data update coordinator."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import humps
+from pyoverkiz.enums import DataType, EventName, ExecutionState
+from pyoverkiz.exceptions import (
+    InvalidCommandException,
+    NotAuthenticatedException,
+    TooManyRequestsException,
+)
+from pyoverkiz.models import Command, Device, Event
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.tahoma.const import (
+    REQUEST_REFRESH_COOLDOWN,
+    SIGNAL_DEVICES_ADDED,
+)
+from custom_components.tahoma.coordinator import (
+    OverkizDataUpdateCoordinator,
+    OverkizDefinitionIndex,
+    OverkizExecutions,
+    parse_devices,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util.dt import utcnow
+
+from . import create_coordinator
+from .fake_overkiz import raw_device
+
+TEST_DEVICE_URL = "io://1234-5678-9123/11111111"
+TEST_DEVICE_URL2 = "io://1234-5678-9123/22222222"
+
+
+def _device(device_url: str) -> Device:
+    """Return a minimal Overkiz device."""
+    return Device(
+        available=True,
+        enabled=True,
+        label="Device",
+        device_url=device_url,
+        controllable_name="io:RollerShutterGenericIOComponent",
+        definition={"commands": [], "states": []},
+        widget="PositionableRollerShutter",
+        ui_class="RollerShutter",
+        states=[],
+        type=1,
+    )
+
+
+def _fetch_events(*batches: list[Event]) -> AsyncMock:
+    """Return a mocked fetch_events, returning each batch of events once."""
+    pending = list(batches)
+    return AsyncMock(side_effect=lambda: pending.pop(0) if pending else [])
+
+
+def _closure_changed(closure: int) -> Event:
+    """Return a state changed event of the closure of the first device."""
+    return Event(
+        name=EventName.DEVICE_STATE_CHANGED,
+        device_url=TEST_DEVICE_URL,
+        device_states=[
+            {"name": "core:ClosureState", "type": DataType.INTEGER, "value": closure}
+        ],
+    )
+
+
+def _coordinator(
+    hass: HomeAssistant, events: list[Event] | None = None
+) -> OverkizDataUpdateCoordinator:
+    """Return a coordinator with a mocked client returning the given events."""
+    return create_coordinator(
+        hass,
+        Mock(fetch_events=_fetch_events(events or [])),
+        [_device(TEST_DEVICE_URL), _device(TEST_DEVICE_URL2)],
+    )
+
+
+@pytest.fixture(name="mock_api")
+def mock_api_fixture() -> Iterator[Mock]:
+    """Mock the Overkiz API endpoints which are not exposed by pyoverkiz."""
+    with patch("custom_components.tahoma.coordinator.api", autospec=True) as mock_api:
+        yield mock_api
+
+
+async def test_only_changed_devices_are_notified(hass: HomeAssistant) -> None:
+    """Test listeners are only called for devices touched by an event."""
+    coordinator = _coordinator(hass, [_closure_changed(50)])
+
+    # The first update will notify every listener
+    await coordinator.async_refresh()
+
+    device_listener = Mock()
+    device2_listener = Mock()
+    coordinator.async_add_listener(device_listener, TEST_DEVICE_URL)
+    coordinator.async_add_listener(device2_listener, TEST_DEVICE_URL2)
+
+    coordinator.client.fetch_events = _fetch_events([_closure_changed(60)])
+    await coordinator.async_refresh()
+
+    assert device_listener.call_count == 1
+    assert device2_listener.call_count == 0
+    assert coordinator.devices[TEST_DEVICE_URL].states["core:ClosureState"].value == 60
+
+
+async def test_updates_without_changes_are_skipped(hass: HomeAssistant) -> None:
+    """Test listeners are not called for empty batches or repeated state values."""
+    coordinator = _coordinator(hass, [_closure_changed(50)])
+    await coordinator.async_refresh()
+
+    listener = Mock()
+    coordinator.async_add_listener(listener)
+
+    await coordinator.async_refresh()
+    coordinator.client.fetch_events = _fetch_events([_closure_changed(50)])
+    await coordinator.async_refresh()
+
+    assert listener.call_count == 0
+    assert coordinator.skipped_listener_updates == 2
+
+
+async def test_pending_events_are_drained(hass: HomeAssistant) -> None:
+    """Test events are fetched again until no events are pending."""
+    coordinator = _coordinator(hass)
+    coordinator.client.fetch_events = _fetch_events(
+        [Event(name=EventName.DEVICE_UNAVAILABLE, device_url=TEST_DEVICE_URL)],
+        [Event(name=EventName.DEVICE_UNAVAILABLE, device_url=TEST_DEVICE_URL2)],
+    )
+
+    with patch("custom_components.tahoma.coordinator.asyncio.sleep") as sleep:
+        await coordinator.async_refresh()
+
+    assert coordinator.client.fetch_events.call_count == 3
+    assert not coordinator.devices[TEST_DEVICE_URL].available
+    assert not coordinator.devices[TEST_DEVICE_URL2].available
+    # Fetches are spaced by the events fetch interval
+    assert sleep.call_count == 2
+    assert all(
+        0 < delay <= coordinator.events_fetch_interval.total_seconds()
+        for (delay,), _ in sleep.call_args_list
+    )
+
+
+async def test_rate_limited_drain_does_not_pause_commands(
+    hass: HomeAssistant,
+) -> None:
+    """Test draining stops when rate limited, without pausing the rate limiter."""
+    coordinator = _coordinator(hass, [_closure_changed(60)])
+    coordinator.events_fetch_interval = timedelta(0)
+    coordinator.client.fetch_events.side_effect = [
+        [_closure_changed(60)],
+        TooManyRequestsException("Too many requests, try again later"),
+    ]
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.client.fetch_events.call_count == 2
+    assert coordinator.devices[TEST_DEVICE_URL].states["core:ClosureState"].value == 60
+    assert coordinator.rate_limiter.rate_limited_count == 0
+
+
+async def test_update_interval_follows_executions(hass: HomeAssistant) -> None:
+    """Test polling speeds up after a command and slows down when it is done."""
+    coordinator = _coordinator(
+        hass, [Event(name=EventName.EXECUTION_REGISTERED, exec_id="exec-1")]
+    )
+
+    await coordinator.async_refresh()
+
+    assert "exec-1" in coordinator.executions
+    assert coordinator.update_interval == coordinator.min_update_interval
+
+    coordinator.client.fetch_events = _fetch_events(
+        [
+            Event(
+                name=EventName.EXECUTION_STATE_CHANGED,
+                exec_id="exec-1",
+                new_state=ExecutionState.COMPLETED,
+            )
+        ]
+    )
+    await coordinator.async_refresh()
+
+    assert not coordinator.executions
+    assert coordinator.update_interval == coordinator.max_update_interval
+
+
+async def test_stuck_executions_are_evicted(hass: HomeAssistant) -> None:
+    """Test executions missing their final event are removed after their max age."""
+    coordinator = _coordinator(hass)
+    coordinator.execution_max_age = timedelta(0)
+    coordinator.executions.add("exec-1", [(TEST_DEVICE_URL, "close")])
+
+    await coordinator.async_refresh()
+    assert "exec-1" in coordinator.executions
+
+    await coordinator.async_refresh()
+    assert not coordinator.executions
+    assert coordinator.update_interval == coordinator.max_update_interval
+
+
+async def test_device_updated_without_reload(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    """Test an updated device is refetched and added without a reload."""
+    coordinator = _coordinator(
+        hass, [Event(name=EventName.DEVICE_UPDATED, device_url=TEST_DEVICE_URL)]
+    )
+    renamed_device = raw_device(11111111)
+    renamed_device["label"] = "Renamed"
+    mock_api.get_raw_device.return_value = renamed_device
+    added_devices = Mock()
+    async_dispatcher_connect(
+        hass, SIGNAL_DEVICES_ADDED.format(coordinator.config_entry_id), added_devices
+    )
+
+    with patch.object(hass.config_entries, "async_reload") as mock_reload, patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as mock_executor_job:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert not mock_reload.called
+    # The device is parsed in the executor
+    assert mock_executor_job.call_args.args[0] is parse_devices
+    # Only the updated device is fetched
+    mock_api.get_raw_device.assert_awaited_once_with(
+        coordinator.client, TEST_DEVICE_URL
+    )
+    added_devices.assert_called_once_with([coordinator.devices[TEST_DEVICE_URL]])
+    assert coordinator.devices[TEST_DEVICE_URL].label == "Renamed"
+    assert "devices" in coordinator.parse_durations
+
+
+async def test_many_devices_updated_are_fetched_at_once(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    """Test more updated devices than the rate limiter burst share a single fetch."""
+    coordinator = _coordinator(
+        hass,
+        [
+            Event(name=EventName.DEVICE_UPDATED, device_url=TEST_DEVICE_URL),
+            Event(name=EventName.DEVICE_UPDATED, device_url=TEST_DEVICE_URL2),
+        ],
+    )
+    coordinator.rate_limiter.burst = 1
+    mock_api.get_raw_devices.return_value = [
+        raw_device(11111111),
+        raw_device(22222222),
+        raw_device(3),
+    ]
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    mock_api.get_raw_devices.assert_awaited_once_with(coordinator.client)
+    mock_api.get_raw_device.assert_not_called()
+    assert sorted(coordinator.devices) == [TEST_DEVICE_URL, TEST_DEVICE_URL2]
+    assert coordinator.devices[TEST_DEVICE_URL].label == "Shutter 11111111"
+
+
+async def test_states_are_resynced_after_relogin(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    """Test a relogin keeps the Device objects and only parses created devices."""
+    coordinator = _coordinator(hass)
+    coordinator.client.fetch_events = AsyncMock(side_effect=NotAuthenticatedException)
+    coordinator.client.login = AsyncMock()
+    mock_api.get_raw_devices.return_value = [
+        raw_device(11111111),
+        raw_device(33333333),
+    ]
+    device = coordinator.devices[TEST_DEVICE_URL]
+    added_devices = Mock()
+    async_dispatcher_connect(
+        hass, SIGNAL_DEVICES_ADDED.format(coordinator.config_entry_id), added_devices
+    )
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.devices[TEST_DEVICE_URL] is device
+    assert device.states["core:ClosureState"].value == 20
+    assert TEST_DEVICE_URL2 not in coordinator.devices
+    added_devices.assert_called_once_with(
+        [coordinator.devices["io://1234-5678-9123/33333333"]]
+    )
+
+
+async def test_executions_are_cleared_after_relogin(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    """Test entities of devices with executions are notified after a relogin."""
+    coordinator = _coordinator(hass)
+    coordinator.client.fetch_events = AsyncMock(side_effect=NotAuthenticatedException)
+    coordinator.client.login = AsyncMock()
+    mock_api.get_raw_devices.return_value = [
+        raw_device(11111111),
+        raw_device(22222222),
+    ]
+    await coordinator.async_refresh()
+    coordinator.executions.add("exec-1", [(TEST_DEVICE_URL2, "close")])
+
+    device_listener = Mock()
+    device2_listener = Mock()
+    coordinator.async_add_listener(device_listener, TEST_DEVICE_URL)
+    coordinator.async_add_listener(device2_listener, TEST_DEVICE_URL2)
+
+    await coordinator.async_refresh()
+
+    assert not coordinator.executions
+    assert device_listener.call_count == 0
+    assert device2_listener.call_count == 1
+
+
+async def test_reloads_are_coalesced(hass: HomeAssistant) -> None:
+    """Test device events without device url result in a single reload."""
+    with patch("custom_components.tahoma.coordinator.RELOAD_COOLDOWN", timedelta(0)):
+        coordinator = _coordinator(
+            hass,
+            [
+                Event(name=EventName.DEVICE_CREATED),
+                Event(name=EventName.DEVICE_UPDATED),
+            ],
+        )
+
+    with patch.object(hass.config_entries, "async_reload") as mock_reload:
+        await coordinator.async_refresh()
+        await asyncio.sleep(0.01)
+        await hass.async_block_till_done()
+
+    assert mock_reload.call_count == 1
+    assert coordinator.suppressed_reloads == 1
+
+
+async def test_commands_are_batched(hass: HomeAssistant, mock_api: Mock) -> None:
+    """Test commands issued at once are executed as a single action group."""
+    coordinator = _coordinator(hass)
+    mock_api.execute_action_group.return_value = "exec-1"
+
+    exec_ids = await asyncio.gather(
+        coordinator.async_execute_command(TEST_DEVICE_URL, Command("close")),
+        coordinator.async_execute_command(TEST_DEVICE_URL2, Command("close")),
+    )
+
+    assert exec_ids == ["exec-1", "exec-1"]
+    mock_api.execute_action_group.assert_awaited_once_with(
+        coordinator.client,
+        {TEST_DEVICE_URL: [Command("close")], TEST_DEVICE_URL2: [Command("close")]},
+        "Home Assistant",
+    )
+    assert coordinator.executions.latest(TEST_DEVICE_URL, ["close"]) == "exec-1"
+    assert coordinator.executions.latest(TEST_DEVICE_URL2, ["close"]) == "exec-1"
+
+
+async def test_rejected_batch_is_executed_per_device(
+    hass: HomeAssistant, mock_api: Mock
+) -> None:
+    """Test commands are executed per device when the action group is rejected."""
+    coordinator = _coordinator(hass)
+    mock_api.execute_action_group.side_effect = InvalidCommandException(
+        "No such command : my"
+    )
+    coordinator.client.execute_commands = AsyncMock(
+        side_effect=[InvalidCommandException("No such command : my"), "exec-2"]
+    )
+
+    exec_ids = await asyncio.gather(
+        coordinator.async_execute_command(TEST_DEVICE_URL, Command("my")),
+        coordinator.async_execute_command(TEST_DEVICE_URL2, Command("close")),
+    )
+
+    assert exec_ids == [None, "exec-2"]
+    assert coordinator.client.execute_commands.call_count == 2
+    assert list(coordinator.executions) == ["exec-2"]
+    assert coordinator.executions.device_urls("exec-2") == {TEST_DEVICE_URL2}
+
+
+async def test_pending_commands_are_released(hass: HomeAssistant) -> None:
+    """Test callers of pending commands return on shutdown or a cancelled batch."""
+    coordinator = _coordinator(hass)
+    coordinator.client.execute_commands = AsyncMock(side_effect=asyncio.CancelledError)
+
+    pending = asyncio.create_task(
+        coordinator.async_execute_command(TEST_DEVICE_URL, Command("close"))
+    )
+    await asyncio.sleep(0)
+    coordinator.async_shutdown()
+
+    assert await pending is None
+    coordinator.client.execute_commands.assert_not_called()
+
+    with patch("custom_components.tahoma.coordinator.COMMAND_BATCH_WINDOW", 0):
+        assert (
+            await coordinator.async_execute_command(TEST_DEVICE_URL, Command("close"))
+            is None
+        )
+
+    coordinator.client.execute_commands.assert_called_once()
+
+
+def test_executions_are_indexed() -> None:
+    """Test running executions are found by device url and command name."""
+    executions = OverkizExecutions()
+    executions.add("exec-1", [(TEST_DEVICE_URL, "open"), (TEST_DEVICE_URL2, "open")])
+    executions.add("exec-2", [(TEST_DEVICE_URL, "close")])
+    executions.add("exec-3", [(TEST_DEVICE_URL, "open")])
+
+    assert executions.is_running(TEST_DEVICE_URL, ["up", "open"])
+    assert not executions.is_running(TEST_DEVICE_URL2, ["close"])
+    assert executions.latest(TEST_DEVICE_URL, ["open", "close"]) == "exec-3"
+
+    executions.pop("exec-3")
+
+    assert executions.latest(TEST_DEVICE_URL, ["open", "close"]) == "exec-2"
+    assert executions.latest(TEST_DEVICE_URL, ["open"]) == "exec-1"
+    assert list(executions) == ["exec-1", "exec-2"]
+
+
+def test_definition_index() -> None:
+    """Test devices are found by the states and commands of their definition."""
+    devices = [
+        Device(**humps.decamelize(raw_device(index))) for index in (11111111, 22222222)
+    ]
+    index = OverkizDefinitionIndex(devices)
+
+    assert list(index.with_state("core:ClosureState")) == [
+        TEST_DEVICE_URL,
+        TEST_DEVICE_URL2,
+    ]
+    assert list(index.with_command("setClosure")) == [TEST_DEVICE_URL, TEST_DEVICE_URL2]
+    assert not index.with_command("my")
+
+    index.remove([TEST_DEVICE_URL])
+
+    assert list(index.with_state("core:ClosureState")) == [TEST_DEVICE_URL2]
+
+
+async def test_commands_share_a_refresh(hass: HomeAssistant) -> None:
+    """Test the refresh after a command is immediate, and shared by the next ones."""
+    coordinator = _coordinator(hass)
+    coordinator.client.execute_commands = AsyncMock(
+        side_effect=["exec-1", "exec-2", "exec-3"]
+    )
+
+    with patch("custom_components.tahoma.coordinator.COMMAND_BATCH_WINDOW", 0):
+        await coordinator.async_execute_command(TEST_DEVICE_URL, Command("close"))
+        await hass.async_block_till_done()
+
+        assert coordinator.client.fetch_events.call_count == 1
+
+        await coordinator.async_execute_command(TEST_DEVICE_URL, Command("open"))
+        await coordinator.async_execute_command(TEST_DEVICE_URL, Command("close"))
+        await hass.async_block_till_done()
+
+    assert coordinator.client.fetch_events.call_count == 1
+
+    async_fire_time_changed(hass, utcnow() + REQUEST_REFRESH_COOLDOWN)
+    await hass.async_block_till_done()
+
+    assert coordinator.client.fetch_events.call_count == 2
+
+
+async def test_superseded_commands_are_replaced(hass: HomeAssistant) -> None:
+    """Test newer arguments replace queued and running commands of a device."""
+    coordinator = _coordinator(hass)
+    coordinator.client.execute_commands = AsyncMock(return_value="exec-2")
+    coordinator.client.cancel_command = AsyncMock()
+    coordinator.executions.add("exec-1", [(TEST_DEVICE_URL, "setClosure")])
+
+    await asyncio.gather(
+        coordinator.async_execute_command(TEST_DEVICE_URL, Command("setClosure", [10])),
+        coordinator.async_execute_command(TEST_DEVICE_URL, Command("setClosure", [20])),
+    )
+
+    coordinator.client.cancel_command.assert_called_once_with("exec-1")
+    coordinator.client.execute_commands.assert_called_once_with(
+        TEST_DEVICE_URL, [Command("setClosure", [20])], "Home Assistant"
+    )
+    assert list(coordinator.executions) == ["exec-2"]
+
+    coordinator.async_shutdown()
@@ -0,0 +1,70 @@
+"""Tests for the Overkiz (by Somfy) executor."""
+from unittest.mock import AsyncMock, Mock
+
+import humps
+from pyoverkiz.models import Device
+
+from custom_components.tahoma.coordinator import OverkizExecutions
+from custom_components.tahoma.executor import OverkizExecutor
+
+from .fake_overkiz import raw_device
+
+
+def test_capabilities_are_shared() -> None:
+    """Test devices of the same type share their capabilities."""
+    devices = {
+        device.device_url: device
+        for device in (Device(**humps.decamelize(raw_device(i))) for i in (1, 2))
+    }
+    coordinator = Mock(data=devices)
+    executor, executor2 = (OverkizExecutor(url, coordinator) for url in devices)
+
+    assert executor.capabilities is executor2.capabilities
+    assert executor.select_command("my", "setClosure", "close") == "setClosure"
+    assert not executor.has_command("my")
+
+
+def test_capabilities_differ_per_definition() -> None:
+    """Test devices of the same type with other commands have other capabilities."""
+    raw_devices = [raw_device(i) for i in (1, 2)]
+    # Same number of commands, e.g. another firmware version
+    raw_devices[1]["definition"]["commands"][0]["commandName"] = "my"
+    devices = {
+        device.device_url: device
+        for device in (Device(**humps.decamelize(raw)) for raw in raw_devices)
+    }
+    coordinator = Mock(data=devices)
+    executor, executor2 = (OverkizExecutor(url, coordinator) for url in devices)
+
+    assert executor.capabilities is not executor2.capabilities
+    assert not executor.has_command("my")
+    assert executor2.has_command("my")
+
+
+async def test_cancel_command_of_shared_execution_stops_device() -> None:
+    """Test an execution of multiple devices is not cancelled, but the device stopped."""
+    raw_devices = [raw_device(i) for i in (1, 2)]
+
+    for device in raw_devices:
+        device["definition"]["commands"].append({"commandName": "stop", "nparams": 0})
+
+    devices = [Device(**humps.decamelize(device)) for device in raw_devices]
+    coordinator = Mock(
+        data={device.device_url: device for device in devices},
+        executions=OverkizExecutions(),
+        async_execute_command=AsyncMock(),
+        rate_limiter=Mock(async_call=AsyncMock()),
+    )
+    coordinator.executions.add(
+        "shared", [(device.device_url, "setClosure") for device in devices]
+    )
+    coordinator.executions.add("single", [(devices[1].device_url, "open")])
+    executor, executor2 = (OverkizExecutor(d.device_url, coordinator) for d in devices)
+
+    assert await executor.async_cancel_command(["setClosure"])
+    coordinator.rate_limiter.async_call.assert_not_called()
+    [(device_url, command), _] = coordinator.async_execute_command.call_args
+    assert (device_url, command.name) == (devices[0].device_url, "stop")
+
+    assert await executor2.async_cancel_command(["open"])
+    assert coordinator.rate_limiter.async_call.call_args.args[2] == "single"
@@ -0,0 +1,130 @@
+"""Tests for the Overkiz (by Somfy) integration setup."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from pyoverkiz.client import OverkizClient
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.tahoma import async_create_client_session
+from custom_components.tahoma.const import (
+    DOMAIN,
+    SESSION_STORAGE_KEY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+
+from .fake_overkiz import TEST_GATEWAY_ID, raw_device, raw_setup
+
+
+async def test_setup_from_stored_setup(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test entities are created from the stored setup before logging in."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        unique_id=TEST_GATEWAY_ID,
+        data={"username": "test", "password": "test", "hub": "somfy_europe"},
+    )
+    entry.add_to_hass(hass)
+    hass_storage[STORAGE_KEY.format(entry.entry_id)] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY.format(entry.entry_id),
+        "data": {"setup": raw_setup(raw_device(1)), "scenarios": []},
+    }
+
+    logged_in = asyncio.Event()
+    live_setup = raw_setup(raw_device(1), raw_device(2))
+
+    with patch.object(OverkizClient, "login", side_effect=logged_in.wait), patch(
+        "custom_components.tahoma.api.get_raw_setup", return_value=live_setup
+    ), patch(
+        "custom_components.tahoma.api.get_raw_scenarios", return_value=[]
+    ), patch.object(
+        OverkizClient, "fetch_events", return_value=[]
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await asyncio.sleep(0)
+
+        assert hass.states.async_entity_ids("cover") == ["cover.shutter_1"]
+
+        logged_in.set()
+        await hass.async_block_till_done()
+
+        assert sorted(hass.states.async_entity_ids("cover")) == [
+            "cover.shutter_1",
+            "cover.shutter_2",
+        ]
+        assert (
+            hass_storage[STORAGE_KEY.format(entry.entry_id)]["data"]["setup"]
+            == live_setup
+        )
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_setup_with_stored_session(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the stored session is reused instead of logging in."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        unique_id=TEST_GATEWAY_ID,
+        data={"username": "test", "password": "test", "hub": "somfy_europe"},
+    )
+    entry.add_to_hass(hass)
+    session_key = SESSION_STORAGE_KEY.format(entry.entry_id)
+    hass_storage[session_key] = {
+        "version": STORAGE_VERSION,
+        "key": session_key,
+        "data": {
+            "username": "test",
+            "cookies": {},
+            "event_listener_id": "listener",
+            "access_token": "token",
+            "refresh_token": "refresh",
+            "expires_in": "2100-01-01T00:00:00",
+        },
+    }
+
+    with patch.object(OverkizClient, "login") as mock_login, patch(
+        "custom_components.tahoma.api.get_raw_setup",
+        return_value=raw_setup(raw_device(1)),
+    ), patch(
+        "custom_components.tahoma.api.get_raw_scenarios", return_value=[]
+    ), patch.object(
+        OverkizClient, "fetch_events", AsyncMock(return_value=[])
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert not mock_login.called
+        assert hass.states.async_entity_ids("cover") == ["cover.shutter_1"]
+
+        # Platforms without entities are not set up
+        loaded_platforms = hass.data[DOMAIN][entry.entry_id].loaded_platforms
+        assert Platform.COVER in loaded_platforms
+        assert Platform.CLIMATE not in loaded_platforms
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+    assert hass_storage[session_key]["data"]["access_token"] == "token"
+    assert hass_storage[session_key]["data"]["event_listener_id"] == "listener"
+
+
+async def test_sessions_share_the_connection_pool(hass: HomeAssistant) -> None:
+    """Test sessions of config entries share connections, but not cookies."""
+    session = async_create_client_session(hass)
+    session2 = async_create_client_session(hass)
+
+    assert session.connector is session2.connector
+    assert session.cookie_jar is not session2.cookie_jar
+
+    session.detach()
+    session2.detach()
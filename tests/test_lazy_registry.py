@@ -0,0 +1,35 @@
+"""Tests for the Overkiz (by Somfy) lazy class registry."""
+import sys
+from unittest.mock import patch
+
+from pyoverkiz.enums import UIWidget
+
+from custom_components.tahoma.lazy_registry import LazyClassRegistry
+from homeassistant.core import HomeAssistant
+
+
+async def test_module_is_imported_on_first_use(hass: HomeAssistant) -> None:
+    """Test the module of a class is only imported, in the executor, when loaded."""
+    module_name = "custom_components.tahoma.water_heater_devices.hitachi_dhw"
+    sys.modules.pop(module_name, None)
+    registry: LazyClassRegistry = LazyClassRegistry(
+        "custom_components.tahoma.water_heater_devices",
+        {UIWidget.HITACHI_DHW: ("hitachi_dhw", "HitachiDHW")},
+    )
+
+    assert UIWidget.HITACHI_DHW in registry
+    assert UIWidget.SOMFY_THERMOSTAT not in registry
+    assert module_name not in sys.modules
+
+    with patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as mock_executor_job:
+        await registry.async_load(
+            hass, [UIWidget.HITACHI_DHW, UIWidget.SOMFY_THERMOSTAT]
+        )
+        # Loaded widgets are not imported again
+        await registry.async_load(hass, [UIWidget.HITACHI_DHW])
+
+    assert mock_executor_job.call_count == 1
+    assert module_name in sys.modules
+    assert registry[UIWidget.HITACHI_DHW].__name__ == "HitachiDHW"
@@ -0,0 +1,129 @@
+"""Tests for the Overkiz (by Somfy) local API with cloud fallback."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+from pyoverkiz.client import OverkizClient
+from pyoverkiz.enums import APIType, EventName
+import pytest
+
+from custom_components.tahoma.const import UPDATE_INTERVAL_LOCAL
+from custom_components.tahoma.coordinator import OverkizDataUpdateCoordinator
+from custom_components.tahoma.entity import OverkizEntity
+from custom_components.tahoma.rate_limiter import Priority
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from . import create_coordinator
+from .fake_overkiz import TEST_TOKEN, FakeOverkizGateway, raw_device
+
+TEST_DEVICE_URL = raw_device(1)["deviceURL"]
+
+# The fake gateway is served on a local socket
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+async def _coordinator(
+    hass: HomeAssistant, aiohttp_server, gateway: FakeOverkizGateway
+) -> OverkizDataUpdateCoordinator:
+    """Return a coordinator using the fake gateway, with a mocked cloud fallback."""
+    server = await aiohttp_server(gateway.app)
+    client = OverkizClient(
+        username="",
+        password="",
+        token=TEST_TOKEN,
+        session=async_create_clientsession(hass),
+        server=FakeOverkizGateway.server(f"{server.host}:{server.port}"),
+        verify_ssl=False,
+    )
+    await client.login()
+    setup = await client.get_setup()
+
+    return create_coordinator(
+        hass,
+        client,
+        setup.devices,
+        fallback_client=Mock(
+            api_type=APIType.CLOUD,
+            login=AsyncMock(return_value=True),
+            fetch_events=AsyncMock(return_value=[]),
+        ),
+        places=setup.root_place,
+        update_interval=UPDATE_INTERVAL_LOCAL,
+        max_update_interval=UPDATE_INTERVAL_LOCAL,
+    )
+
+
+async def test_events_from_local_api(hass: HomeAssistant, aiohttp_server) -> None:
+    """Test events are fetched from the local API."""
+    gateway = FakeOverkizGateway(raw_device(1))
+    coordinator = await _coordinator(hass, aiohttp_server, gateway)
+    gateway.events.append(
+        {
+            "name": EventName.DEVICE_STATE_CHANGED,
+            "deviceURL": TEST_DEVICE_URL,
+            "deviceStates": [{"name": "core:ClosureState", "type": 1, "value": 80}],
+        }
+    )
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.client is coordinator.primary_client
+    assert coordinator.data[TEST_DEVICE_URL].states["core:ClosureState"].value == 80
+
+
+async def test_setup_without_places(hass: HomeAssistant, aiohttp_server) -> None:
+    """Test entities are created from the local API setup, which has no places."""
+    gateway = FakeOverkizGateway(raw_device(1))
+    coordinator = await _coordinator(hass, aiohttp_server, gateway)
+
+    await coordinator.async_refresh()
+    entity = OverkizEntity(TEST_DEVICE_URL, coordinator)
+
+    assert coordinator.areas == {}
+    assert entity.device_info["suggested_area"] is None
+
+
+async def test_fallback_to_cloud_when_slow(hass: HomeAssistant, aiohttp_server) -> None:
+    """Test the cloud API is used when the local API is slow."""
+    gateway = FakeOverkizGateway(raw_device(1))
+    coordinator = await _coordinator(hass, aiohttp_server, gateway)
+    gateway.latency = 0.05
+
+    with patch(
+        "custom_components.tahoma.coordinator.LOCAL_MAX_LATENCY",
+        timedelta(milliseconds=10),
+    ):
+        for _ in range(3):
+            await coordinator.async_refresh()
+
+    assert coordinator.client is coordinator.fallback_client
+    coordinator.fallback_client.login.assert_called_once()
+    assert coordinator.max_update_interval > UPDATE_INTERVAL_LOCAL
+
+
+async def test_no_fallback_when_rate_limited(
+    hass: HomeAssistant, aiohttp_server
+) -> None:
+    """Test waiting for the rate limiter does not count as latency of the gateway."""
+    gateway = FakeOverkizGateway(raw_device(1))
+    coordinator = await _coordinator(hass, aiohttp_server, gateway)
+    async_acquire = coordinator.rate_limiter.async_acquire
+
+    async def delayed_acquire(priority: Priority) -> None:
+        await asyncio.sleep(0.05)
+        await async_acquire(priority)
+
+    with patch(
+        "custom_components.tahoma.coordinator.LOCAL_MAX_LATENCY",
+        timedelta(milliseconds=10),
+    ), patch.object(coordinator.rate_limiter, "async_acquire", delayed_acquire):
+        for _ in range(3):
+            await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.client is coordinator.primary_client
+    coordinator.fallback_client.login.assert_not_called()
@@ -0,0 +1,63 @@
+"""Tests for the Overkiz (by Somfy) API rate limiter."""
+import asyncio
+from unittest.mock import AsyncMock
+
+from pyoverkiz.exceptions import TooManyRequestsException
+import pytest
+
+from custom_components.tahoma.rate_limiter import OverkizRateLimiter, Priority
+
+
+async def test_requests_are_served_by_priority() -> None:
+    """Test waiting commands are served before polling and diagnostics."""
+    rate_limiter = OverkizRateLimiter(100, 1, min_backoff=1, max_backoff=10)
+    served = []
+
+    async def request(priority: Priority) -> None:
+        await rate_limiter.async_acquire(priority)
+        served.append(priority)
+
+    await rate_limiter.async_acquire(Priority.POLLING)
+    await asyncio.gather(
+        request(Priority.DIAGNOSTICS),
+        request(Priority.POLLING),
+        request(Priority.COMMAND),
+    )
+
+    assert served == [Priority.COMMAND, Priority.POLLING, Priority.DIAGNOSTICS]
+
+
+async def test_rate_is_reduced_when_rate_limited() -> None:
+    """Test requests are paused and slowed down after a rate limited request."""
+    rate_limiter = OverkizRateLimiter(2, 10, min_backoff=0.01, max_backoff=10)
+    function = AsyncMock(side_effect=[TooManyRequestsException, "result"])
+
+    with pytest.raises(TooManyRequestsException):
+        await rate_limiter.async_call(Priority.POLLING, function)
+
+    assert rate_limiter.rate_limited_count == 1
+    assert rate_limiter.current_rate == 1
+
+    assert await rate_limiter.async_call(Priority.POLLING, function) == "result"
+    assert rate_limiter.current_rate > 1
+
+
+async def test_concurrent_calls_are_shared() -> None:
+    """Test concurrent identical calls share a single request."""
+    rate_limiter = OverkizRateLimiter(2, 10, min_backoff=1, max_backoff=10)
+    calls = []
+
+    async def login() -> str:
+        calls.append(None)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(
+        *(rate_limiter.async_call_once(Priority.POLLING, login) for _ in range(3))
+    )
+
+    assert results == ["result"] * 3
+    assert len(calls) == 1
+
+    await rate_limiter.async_call_once(Priority.POLLING, login)
+    assert len(calls) == 2